@@ -1,13 +1,69 @@
 from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from .models import Broadcast, Event, Media, Group, BroadcastView, EventRSVPLog
 
 
+class SlimM2MFieldsMixin:
+    """Load only the columns needed to label user/group M2M widgets"""
+    user_m2m_fields = []
+    group_m2m_fields = []
+
+    def formfield_for_manytomany(self, db_field, request, **kwargs):
+        if db_field.name in self.user_m2m_fields:
+            kwargs['queryset'] = get_user_model().objects.only('id', 'username', 'email')
+        elif db_field.name in self.group_m2m_fields:
+            kwargs['queryset'] = Group.objects.only('id', 'name')
+        return super().formfield_for_manytomany(db_field, request, **kwargs)
+
+
+class EstimatedCountPaginator(Paginator):
+    """Use the Postgres planner row estimate instead of COUNT(*) for unfiltered lists"""
+    exact_count_below = 1000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples::BIGINT FROM pg_class WHERE relname = %s',
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+            if row and row[0] >= self.exact_count_below:
+                return row[0]
+        return super().count
+
+
+class EstimatedCountMixin:
+    """Skip full-table COUNT(*) queries on large changelists"""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class ChangelistColumnsMixin:
+    """Only load the columns the changelist renders (skips large text fields)"""
+    changelist_only = []
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        match = getattr(request, 'resolver_match', None)
+        if self.changelist_only and match and match.url_name.endswith('_changelist'):
+            queryset = queryset.only(*self.changelist_only)
+        return queryset
+
+
 @admin.register(Group)
 class GroupAdmin(admin.ModelAdmin):
     list_display = ['name', 'group_type', 'department', 'members_count', 'created_by', 'created_at']
+    list_select_related = ['created_by']
     list_filter = ['group_type', 'department', 'created_at']
     search_fields = ['name', 'description', 'department']
     readonly_fields = ['created_at', 'updated_at', 'members_count']
@@ -26,8 +82,11 @@ class GroupAdmin(admin.ModelAdmin):
         })
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_members_count()
+
     def members_count(self, obj):
-        return obj.members.count()
+        return obj.members_count
     members_count.short_description = 'Members'
 
     def save_model(self, request, obj, form, change):
@@ -39,6 +98,7 @@ class GroupAdmin(admin.ModelAdmin):
 @admin.register(Media)
 class MediaAdmin(admin.ModelAdmin):
     list_display = ['file_name', 'file_type', 'file_size_display', 'uploaded_by', 'uploaded_at']
+    list_select_related = ['uploaded_by']
     list_filter = ['file_type', 'uploaded_at']
     search_fields = ['file_name']
     readonly_fields = ['file_name', 'file_type', 'file_size', 'uploaded_at', 'file_preview']
@@ -64,29 +124,29 @@ class MediaAdmin(admin.ModelAdmin):
     file_preview.short_description = 'Preview'
 
 
-class BroadcastViewInline(admin.TabularInline):
-    model = BroadcastView
-    extra = 0
-    readonly_fields = ['user', 'viewed_at', 'ip_address']
-
-
 @admin.register(Broadcast)
-class BroadcastAdmin(admin.ModelAdmin):
+class BroadcastAdmin(EstimatedCountMixin, ChangelistColumnsMixin, SlimM2MFieldsMixin, admin.ModelAdmin):
     list_display = [
         'title', 'priority', 'audience_type', 'start_date', 'end_date',
         'is_published', 'acknowledgment_rate_display', 'created_by', 'created_at'
     ]
+    list_select_related = ['created_by']
+    changelist_only = [
+        'id', 'title', 'priority', 'audience_type', 'start_date', 'end_date',
+        'is_published', 'is_active', 'created_by', 'created_at'
+    ]
     list_filter = [
         'priority', 'audience_type', 'is_published', 'send_email', 'created_at', 'start_date'
     ]
     search_fields = ['title', 'description']
     readonly_fields = [
         'created_at', 'updated_at', 'acknowledgment_rate', 'total_recipients',
-        'acknowledgment_count', 'view_count'
+        'acknowledgment_count', 'view_count', 'view_logs_link'
     ]
-    filter_horizontal = ['attachments', 'target_groups', 'target_users', 'acknowledged_by', 'viewed_by']
+    autocomplete_fields = ['attachments', 'target_groups', 'target_users', 'acknowledged_by', 'viewed_by']
+    user_m2m_fields = ['target_users', 'acknowledged_by', 'viewed_by']
+    group_m2m_fields = ['target_groups']
     date_hierarchy = 'created_at'
-    inlines = [BroadcastViewInline]
     
     fieldsets = (
         ('Content', {
@@ -103,7 +163,7 @@ class BroadcastAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         ('Analytics', {
-            'fields': ('acknowledgment_rate', 'total_recipients', 'acknowledgment_count', 'view_count'),
+            'fields': ('acknowledgment_rate', 'total_recipients', 'acknowledgment_count', 'view_count', 'view_logs_link'),
             'classes': ('collapse',)
         }),
         ('Meta', {
@@ -112,55 +172,67 @@ class BroadcastAdmin(admin.ModelAdmin):
         })
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_ack_rate().with_view_count()
+
     def acknowledgment_rate_display(self, obj):
         rate = obj.acknowledgment_rate
         color = 'green' if rate >= 80 else 'orange' if rate >= 50 else 'red'
         return format_html(
-            '<span style="color: {};">{:.1f}%</span>',
-            color, rate
+            '<span style="color: {};">{}%</span>',
+            color, f"{rate:.1f}"
         )
     acknowledgment_rate_display.short_description = 'Ack Rate'
 
     def acknowledgment_count(self, obj):
-        return obj.acknowledged_by.count()
+        return obj.ack_count_
     acknowledgment_count.short_description = 'Acknowledgments'
 
     def view_count(self, obj):
-        return obj.viewed_by.count()
+        return obj.view_count_
     view_count.short_description = 'Views'
 
+    def view_logs_link(self, obj):
+        """Link to the view log instead of rendering every row inline"""
+        url = reverse('admin:communication_broadcastview_changelist')
+        return format_html(
+            '<a href="{}?broadcast__id__exact={}">See {} views</a>',
+            url, obj.pk, obj.view_logs.count()
+        )
+    view_logs_link.short_description = 'View log'
+
     def save_model(self, request, obj, form, change):
         if not change:
             obj.created_by = request.user
         super().save_model(request, obj, form, change)
 
 
-class EventRSVPLogInline(admin.TabularInline):
-    model = EventRSVPLog
-    extra = 0
-    readonly_fields = ['user', 'old_status', 'new_status', 'changed_at']
-
-
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
+class EventAdmin(EstimatedCountMixin, ChangelistColumnsMixin, SlimM2MFieldsMixin, admin.ModelAdmin):
     list_display = [
         'title', 'date', 'time', 'venue', 'event_type', 'is_important',
         'rsvp_summary', 'created_by', 'created_at'
     ]
+    list_select_related = ['created_by']
+    changelist_only = [
+        'id', 'title', 'date', 'time', 'venue', 'event_type', 'is_important',
+        'created_by', 'created_at'
+    ]
     list_filter = [
         'event_type', 'is_important', 'date', 'created_at', 'is_public'
     ]
     search_fields = ['title', 'description', 'venue']
     readonly_fields = [
         'created_at', 'updated_at', 'total_rsvp_yes', 'total_rsvp_no',
-        'total_rsvp_maybe', 'total_rsvp', 'is_upcoming'
+        'total_rsvp_maybe', 'total_rsvp', 'is_upcoming', 'rsvp_logs_link'
     ]
-    filter_horizontal = [
+    autocomplete_fields = [
         'media', 'visible_to_groups', 'visible_to_users',
         'rsvp_yes', 'rsvp_no', 'rsvp_maybe'
     ]
+    user_m2m_fields = ['visible_to_users', 'rsvp_yes', 'rsvp_no', 'rsvp_maybe']
+    group_m2m_fields = ['visible_to_groups']
     date_hierarchy = 'date'
-    inlines = [EventRSVPLogInline]
     
     fieldsets = (
         ('Event Details', {
@@ -177,7 +249,7 @@ class EventAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         ('Analytics', {
-            'fields': ('total_rsvp_yes', 'total_rsvp_no', 'total_rsvp_maybe', 'total_rsvp', 'is_upcoming'),
+            'fields': ('total_rsvp_yes', 'total_rsvp_no', 'total_rsvp_maybe', 'total_rsvp', 'is_upcoming', 'rsvp_logs_link'),
             'classes': ('collapse',)
         }),
         ('Meta', {
@@ -186,6 +258,9 @@ class EventAdmin(admin.ModelAdmin):
         })
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_rsvp_counts()
+
     def rsvp_summary(self, obj):
         yes = obj.total_rsvp_yes
         no = obj.total_rsvp_no
@@ -198,6 +273,15 @@ class EventAdmin(admin.ModelAdmin):
         )
     rsvp_summary.short_description = 'RSVP (Y/N/M)'
 
+    def rsvp_logs_link(self, obj):
+        """Link to the RSVP log instead of rendering every row inline"""
+        url = reverse('admin:communication_eventrsvplog_changelist')
+        return format_html(
+            '<a href="{}?event__id__exact={}">See {} RSVP changes</a>',
+            url, obj.pk, obj.rsvp_logs.count()
+        )
+    rsvp_logs_link.short_description = 'RSVP log'
+
     def save_model(self, request, obj, form, change):
         if not change:
             obj.created_by = request.user
@@ -205,8 +289,9 @@ class EventAdmin(admin.ModelAdmin):
 
 
 @admin.register(BroadcastView)
-class BroadcastViewAdmin(admin.ModelAdmin):
+class BroadcastViewAdmin(EstimatedCountMixin, admin.ModelAdmin):
     list_display = ['broadcast', 'user', 'viewed_at', 'ip_address']
+    list_select_related = ['broadcast', 'user']
     list_filter = ['viewed_at']
     search_fields = ['broadcast__title', 'user__username', 'user__email']
     readonly_fields = ['broadcast', 'user', 'viewed_at', 'ip_address']
@@ -219,8 +304,9 @@ class BroadcastViewAdmin(admin.ModelAdmin):
 
 
 @admin.register(EventRSVPLog)
-class EventRSVPLogAdmin(admin.ModelAdmin):
+class EventRSVPLogAdmin(EstimatedCountMixin, admin.ModelAdmin):
     list_display = ['event', 'user', 'old_status', 'new_status', 'changed_at']
+    list_select_related = ['event', 'user']
     list_filter = ['old_status', 'new_status', 'changed_at']
     search_fields = ['event__title', 'user__username', 'user__email']
     readonly_fields = ['event', 'user', 'old_status', 'new_status', 'changed_at']
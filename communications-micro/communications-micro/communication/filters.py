@@ -1,7 +1,6 @@
 import django_filters
-from django.db.models import Q
-from django.utils import timezone
-from .models import Broadcast, Event
+from django.db.models import Exists, OuterRef, Q
+from .models import Broadcast, Event, upcoming_event_q, visible_broadcast_q
 
 
 class BroadcastFilter(django_filters.FilterSet):
@@ -25,21 +24,9 @@ class BroadcastFilter(django_filters.FilterSet):
 
     def filter_is_active(self, queryset, name, value):
         """Filter for currently active/visible broadcasts"""
-        now = timezone.now()
         if value:
-            return queryset.filter(
-                start_date__lte=now,
-                end_date__gte=now,
-                is_published=True,
-                is_active=True
-            )
-        else:
-            return queryset.exclude(
-                start_date__lte=now,
-                end_date__gte=now,
-                is_published=True,
-                is_active=True
-            )
+            return queryset.visible()
+        return queryset.exclude(visible_broadcast_q())
 
     def filter_acknowledged(self, queryset, name, value):
         """Filter broadcasts by acknowledgment status for current user"""
@@ -47,10 +34,10 @@ class BroadcastFilter(django_filters.FilterSet):
         if not user.is_authenticated:
             return queryset.none()
         
-        if value:
-            return queryset.filter(acknowledged_by=user)
-        else:
-            return queryset.exclude(acknowledged_by=user)
+        acked = Exists(Broadcast.acknowledged_by.through.objects.filter(
+            broadcast_id=OuterRef('pk'), user_id=user.id
+        ))
+        return queryset.filter(acked if value else ~acked)
 
     def filter_viewed(self, queryset, name, value):
         """Filter broadcasts by view status for current user"""
@@ -58,10 +45,10 @@ class BroadcastFilter(django_filters.FilterSet):
         if not user.is_authenticated:
             return queryset.none()
         
-        if value:
-            return queryset.filter(viewed_by=user)
-        else:
-            return queryset.exclude(viewed_by=user)
+        viewed = Exists(Broadcast.viewed_by.through.objects.filter(
+            broadcast_id=OuterRef('pk'), user_id=user.id
+        ))
+        return queryset.filter(viewed if value else ~viewed)
 
 
 class EventFilter(django_filters.FilterSet):
@@ -87,11 +74,10 @@ class EventFilter(django_filters.FilterSet):
 
     def filter_upcoming(self, queryset, name, value):
         """Filter for upcoming events"""
-        now = timezone.now()
         if value:
-            return queryset.filter(date__gte=now.date())
+            return queryset.filter(upcoming_event_q())
         else:
-            return queryset.filter(date__lt=now.date())
+            return queryset.exclude(upcoming_event_q())
 
     def filter_rsvp_status(self, queryset, name, value):
         """Filter events by user's RSVP status"""
@@ -99,11 +85,12 @@ class EventFilter(django_filters.FilterSet):
         if not user.is_authenticated:
             return queryset.none()
         
-        if value == 'yes':
-            return queryset.filter(rsvp_yes=user)
-        elif value == 'no':
-            return queryset.filter(rsvp_no=user)
-        elif value == 'maybe':
-            return queryset.filter(rsvp_maybe=user)
+        through = {
+            'yes': Event.rsvp_yes.through,
+            'no': Event.rsvp_no.through,
+            'maybe': Event.rsvp_maybe.through,
+        }.get(value)
+        if through is None:
+            return queryset
         
-        return queryset
\ No newline at end of file
+        return queryset.filter(Exists(through.objects.filter(event_id=OuterRef('pk'), user_id=user.id)))
\ No newline at end of file
@@ -0,0 +1,11 @@
+from django.utils import timezone
+
+
+class RequestTimeMiddleware:
+    """Stamp each request with one timezone.now() to reuse while handling it"""
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._now = timezone.now()
+        return self.get_response(request)
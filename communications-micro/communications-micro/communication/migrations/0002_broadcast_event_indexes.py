@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='broadcast',
+            index=models.Index(fields=['is_published', 'is_active', 'start_date', 'end_date'], name='communicati_is_publ_106916_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='broadcast',
+            index=models.Index(fields=['-created_at'], name='communicati_created_7657fc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='broadcastview',
+            index=models.Index(fields=['broadcast', 'viewed_at'], name='communicati_broadca_6b8839_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['date', 'time'], name='communicati_date_049675_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['is_important', 'date'], name='communicati_is_impo_1b3c9e_idx'),
+        ),
+    ]
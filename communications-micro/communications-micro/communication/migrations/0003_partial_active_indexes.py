@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0002_broadcast_event_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='broadcast',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_published', True)), fields=['start_date', 'end_date'], name='bcast_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['date'], name='event_active_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:37
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def close_inverted_windows(apps, schema_editor):
+    """Give broadcasts with end_date <= start_date a one-second window so the check can be added"""
+    Broadcast = apps.get_model('communication', 'Broadcast')
+    # Such rows were never (or only instantaneously) visible; this keeps them effectively hidden
+    Broadcast.objects.filter(end_date__lte=models.F('start_date')).update(
+        end_date=models.F('start_date') + timedelta(seconds=1)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0003_partial_active_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(close_inverted_windows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='broadcast',
+            constraint=models.CheckConstraint(check=models.Q(('end_date__gt', models.F('start_date'))), name='broadcast_end_after_start'),
+        ),
+    ]
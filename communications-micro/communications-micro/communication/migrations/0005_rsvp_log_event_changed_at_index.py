@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-15 07:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communication', '0004_broadcast_end_after_start'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eventrsvplog',
+            index=models.Index(fields=['event', 'changed_at'], name='communicati_event_i_2b645a_idx'),
+        ),
+    ]
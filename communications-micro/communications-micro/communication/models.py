@@ -1,17 +1,88 @@
 from django.db import models
+from django.db.models import BooleanField, Case, Count, Exists, ExpressionWrapper, F, FloatField, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Cast, Coalesce, Concat, Now, NullIf, Trim
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.validators import FileExtensionValidator
 from django.utils import timezone
 import os
+import uuid
+
+# File extension -> Media.file_type; anything unlisted is a 'document'
+_EXT_TYPE = {
+    **{ext: 'image' for ext in ('.jpg', '.jpeg', '.png', '.gif')},
+    **{ext: 'video' for ext in ('.mp4', '.avi', '.mov')},
+    '.pdf': 'pdf',
+}
 
 def upload_to_media(instance, filename):
     """Upload media files to organized folders"""
-    return f'communications/media/{timezone.now().year}/{timezone.now().month}/{filename}'
+    now = timezone.now()
+    return f'communications/media/{now.year}/{now.month}/{filename}'
 
 def upload_to_attachments(instance, filename):
     """Upload attachment files to organized folders"""
-    return f'communications/attachments/{timezone.now().year}/{timezone.now().month}/{filename}'
+    now = timezone.now()
+    return f'communications/attachments/{now.year}/{now.month}/{filename}'
+
+ACTIVE_USER_COUNT_KEY = 'communication:active_user_count'
+
+def active_user_count():
+    """Number of active users, cached for 60s (cleared by user save/delete signals)"""
+    count = cache.get(ACTIVE_USER_COUNT_KEY)
+    if count is None:
+        count = get_user_model().objects.filter(is_active=True).count()
+        cache.set(ACTIVE_USER_COUNT_KEY, count, 60)
+    return count
+
+def list_version(kind):
+    """Opaque stamp for a kind's list/analytics payloads; signals drop it when the rows behind them change"""
+    key = f'communication:{kind}_version'
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+def bump_list_version(*kinds):
+    """Invalidate conditional-GET ETags for the given kinds ('broadcast', 'event')"""
+    cache.delete_many([f'communication:{kind}_version' for kind in kinds])
+
+def m2m_count_subquery(through_model, fk_name, outer='pk'):
+    """Correlated COUNT over an M2M through table, avoiding JOIN fan-out"""
+    return Coalesce(
+        Subquery(
+            through_model.objects.filter(**{fk_name: OuterRef(outer)})
+            .order_by().values(fk_name).annotate(c=Count('*')).values('c'),
+            output_field=IntegerField()
+        ),
+        0
+    )
+
+
+def full_name_expression(prefix=''):
+    """SQL equivalent of f"{first_name} {last_name}".strip() or username"""
+    return Coalesce(
+        NullIf(Trim(Concat(F(f'{prefix}first_name'), Value(' '), F(f'{prefix}last_name'))), Value('')),
+        F(f'{prefix}username'),
+    )
+
+
+class GroupQuerySet(models.QuerySet):
+    def with_members_count(self):
+        """Annotate members_count_ so serializing a page doesn't count per row"""
+        return self.annotate(members_count_=m2m_count_subquery(Group.members.through, 'group_id'))
+
+    def accessible_to(self, user):
+        """Public groups plus those the user belongs to, owns or created (EXISTS, no DISTINCT)"""
+        return self.filter(
+            Q(group_type='public') |
+            Q(created_by=user) |
+            Exists(Group.members.through.objects.filter(group_id=OuterRef('pk'), user_id=user.id)) |
+            Exists(Group.owners.through.objects.filter(group_id=OuterRef('pk'), user_id=user.id))
+        )
 
 
 class Group(models.Model):
@@ -32,9 +103,17 @@ class Group(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
 
+    objects = GroupQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
+    @property
+    def members_count(self):
+        if hasattr(self, 'members_count_'):
+            return self.members_count_
+        return self.members.count()
+
     class Meta:
         db_table = 'communication_groups'
 
@@ -65,14 +144,7 @@ class Media(models.Model):
             
             # Determine file type based on extension
             ext = os.path.splitext(self.file_name)[1].lower()
-            if ext in ['.jpg', '.jpeg', '.png', '.gif']:
-                self.file_type = 'image'
-            elif ext in ['.mp4', '.avi', '.mov']:
-                self.file_type = 'video'
-            elif ext == '.pdf':
-                self.file_type = 'pdf'
-            else:
-                self.file_type = 'document'
+            self.file_type = _EXT_TYPE.get(ext, 'document')
         
         super().save(*args, **kwargs)
 
@@ -83,6 +155,83 @@ class Media(models.Model):
         db_table = 'communication_media'
 
 
+def visible_broadcast_q():
+    """Q matching published, active broadcasts whose window contains the DB clock"""
+    return Q(is_published=True, is_active=True, start_date__lte=Now(), end_date__gte=Now())
+
+
+class BroadcastQuerySet(models.QuerySet):
+    def visible(self):
+        """Broadcasts currently visible (database-side counterpart of is_visible)"""
+        return self.filter(visible_broadcast_q())
+
+    def with_stats(self):
+        """Annotate recipients_ and ack_count_ used by total_recipients/acknowledgment_rate"""
+        group_members = Group.members.through.objects.filter(
+            group__targeted_broadcasts=OuterRef('pk')
+        ).order_by().values('group__targeted_broadcasts').annotate(
+            c=Count('user_id', distinct=True)
+        ).values('c')
+        return self.annotate(
+            ack_count_=m2m_count_subquery(Broadcast.acknowledged_by.through, 'broadcast'),
+            recipients_=Case(
+                When(audience_type='all', then=Value(active_user_count())),
+                When(audience_type='groups', then=Coalesce(Subquery(group_members, output_field=IntegerField()), 0)),
+                default=m2m_count_subquery(Broadcast.target_users.through, 'broadcast'),
+                output_field=IntegerField()
+            )
+        )
+
+    def targeting(self, user):
+        """Broadcasts addressed to the user, or created by them (EXISTS, no DISTINCT)"""
+        in_target_group = Exists(Broadcast.target_groups.through.objects.filter(
+            broadcast_id=OuterRef('pk'),
+            group_id__in=Group.members.through.objects.filter(user_id=user.id).values('group_id')
+        ))
+        is_target_user = Exists(Broadcast.target_users.through.objects.filter(
+            broadcast_id=OuterRef('pk'), user_id=user.id
+        ))
+        return self.filter(
+            Q(audience_type='all') |
+            (Q(audience_type='groups') & in_target_group) |
+            (Q(audience_type='users') & is_target_user) |
+            Q(created_by=user)
+        )
+
+    def with_ack_rate(self):
+        """with_stats() plus ack_rate_, the acknowledgment percentage computed in SQL"""
+        return self.with_stats().annotate(
+            ack_rate_=Coalesce(
+                ExpressionWrapper(
+                    Cast('ack_count_', FloatField()) * 100 / NullIf('recipients_', 0),
+                    output_field=FloatField()
+                ),
+                Value(0.0),
+                output_field=FloatField()
+            )
+        )
+
+    def with_created_by_name(self):
+        return self.annotate(created_by_name_=full_name_expression('created_by__'))
+
+    def with_view_count(self):
+        """Annotate view_count_ (distinct viewers) for analytics/admin"""
+        return self.annotate(view_count_=m2m_count_subquery(Broadcast.viewed_by.through, 'broadcast'))
+
+    def with_attachments_count(self):
+        """Annotate attachments_count_ so serializing a page doesn't count per row"""
+        return self.annotate(attachments_count_=m2m_count_subquery(Broadcast.attachments.through, 'broadcast_id'))
+
+    def with_user_context(self, user):
+        """Annotate whether the user has acknowledged/viewed each broadcast"""
+        user_id = user.id
+        return self.annotate(
+            _ctx_user_id=Value(user_id, output_field=IntegerField()),
+            _acked=Exists(Broadcast.acknowledged_by.through.objects.filter(broadcast_id=OuterRef('pk'), user_id=user_id)),
+            _viewed=Exists(Broadcast.viewed_by.through.objects.filter(broadcast_id=OuterRef('pk'), user_id=user_id)),
+        )
+
+
 class Broadcast(models.Model):
     """Broadcast model for company-wide announcements"""
     PRIORITY_CHOICES = [
@@ -120,37 +269,157 @@ class Broadcast(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = BroadcastQuerySet.as_manager()
+
     def __str__(self):
         return self.title
 
     @property
     def is_visible(self):
         """Check if broadcast is currently visible"""
-        now = timezone.now()
+        # Views may stamp a request-wide timestamp to reuse here
+        now = getattr(self, '_now_override', None) or timezone.now()
         return self.start_date <= now <= self.end_date and self.is_published and self.is_active
 
+    @property
+    def attachments_count(self):
+        if hasattr(self, 'attachments_count_'):
+            return self.attachments_count_
+        return self.attachments.count()
+
     @property
     def total_recipients(self):
         """Calculate total number of recipients"""
-        User = get_user_model()
+        # Annotated up front by BroadcastQuerySet.with_stats()
+        recipients = getattr(self, 'recipients_', None)
+        if recipients is not None:
+            return recipients
+
         if self.audience_type == 'all':
-            return User.objects.filter(is_active=True).count()
+            return active_user_count()
         elif self.audience_type == 'groups':
-            return User.objects.filter(user_groups__in=self.target_groups.all()).distinct().count()
+            # Count distinct members straight from the membership table
+            return Group.members.through.objects.filter(
+                group_id__in=Broadcast.target_groups.through.objects.filter(broadcast_id=self.pk).values('group_id')
+            ).values('user_id').distinct().count()
         else:
             return self.target_users.count()
 
+    def _has_user_context(self, user):
+        return hasattr(self, '_ctx_user_id') and self._ctx_user_id == user.id
+
+    def _prefetched_user_ids(self, relation):
+        """Ids from a prefetch_related() of relation, or None if it wasn't prefetched"""
+        users = getattr(self, '_prefetched_objects_cache', {}).get(relation)
+        if users is None:
+            return None
+        ids = self.__dict__.setdefault('_prefetched_id_sets', {})
+        if relation not in ids:
+            ids[relation] = {u.id for u in users}
+        return ids[relation]
+
+    def is_acknowledged_by(self, user):
+        if self._has_user_context(user):
+            return self._acked
+        acked_ids = self._prefetched_user_ids('acknowledged_by')
+        if acked_ids is not None:
+            return user.id in acked_ids
+        return self.acknowledged_by.filter(id=user.id).exists()
+
+    def is_viewed_by(self, user):
+        if self._has_user_context(user):
+            return self._viewed
+        viewed_ids = self._prefetched_user_ids('viewed_by')
+        if viewed_ids is not None:
+            return user.id in viewed_ids
+        return self.viewed_by.filter(id=user.id).exists()
+
+    def user_in_target_groups(self, user):
+        """Check group targeting against the membership through table"""
+        return Group.members.through.objects.filter(
+            user_id=user.id,
+            group_id__in=Broadcast.target_groups.through.objects.filter(broadcast_id=self.pk).values('group_id')
+        ).exists()
+
     @property
     def acknowledgment_rate(self):
         """Calculate acknowledgment percentage"""
+        rate = getattr(self, 'ack_rate_', None)
+        if rate is not None:
+            return rate
+
         total = self.total_recipients
         if total == 0:
             return 0
-        return (self.acknowledged_by.count() / total) * 100
+        acks = getattr(self, 'ack_count_', None)
+        if acks is None:
+            acks = self.acknowledged_by.count()
+        return (acks / total) * 100
 
     class Meta:
         db_table = 'communication_broadcasts'
         ordering = ['-created_at']
+        constraints = [
+            models.CheckConstraint(check=Q(end_date__gt=F('start_date')), name='broadcast_end_after_start'),
+        ]
+        indexes = [
+            models.Index(fields=['is_published', 'is_active', 'start_date', 'end_date']),
+            models.Index(fields=['-created_at']),
+            models.Index(
+                fields=['start_date', 'end_date'], name='bcast_active_idx',
+                condition=Q(is_published=True, is_active=True),
+            ),
+        ]
+
+
+def upcoming_event_q():
+    """Q matching events whose local date/time is still ahead (index-friendly)"""
+    now = timezone.localtime()
+    return Q(date__gt=now.date()) | Q(date=now.date(), time__gt=now.time())
+
+
+class EventQuerySet(models.QuerySet):
+    def with_rsvp_counts(self):
+        """Annotate per-status RSVP counts read by the total_rsvp_* properties"""
+        return self.annotate(
+            rsvp_yes_count_=m2m_count_subquery(Event.rsvp_yes.through, 'event'),
+            rsvp_no_count_=m2m_count_subquery(Event.rsvp_no.through, 'event'),
+            rsvp_maybe_count_=m2m_count_subquery(Event.rsvp_maybe.through, 'event'),
+        )
+
+    def with_created_by_name(self):
+        return self.annotate(created_by_name_=full_name_expression('created_by__'))
+
+    def with_upcoming(self):
+        """Annotate is_upcoming_ in SQL so rows don't combine date/time in Python"""
+        return self.annotate(is_upcoming_=ExpressionWrapper(upcoming_event_q(), output_field=BooleanField()))
+
+    def with_user_context(self, user):
+        """Annotate per-user RSVP and visibility flags used by Event helpers"""
+        user_id = user.id
+        return self.annotate(
+            _ctx_user_id=Value(user_id, output_field=IntegerField()),
+            _rsvp_yes=Exists(Event.rsvp_yes.through.objects.filter(event_id=OuterRef('pk'), user_id=user_id)),
+            _rsvp_no=Exists(Event.rsvp_no.through.objects.filter(event_id=OuterRef('pk'), user_id=user_id)),
+            _rsvp_maybe=Exists(Event.rsvp_maybe.through.objects.filter(event_id=OuterRef('pk'), user_id=user_id)),
+            _visible_user=Exists(Event.visible_to_users.through.objects.filter(event_id=OuterRef('pk'), user_id=user_id)),
+            _visible_group=Exists(Event.visible_to_groups.through.objects.filter(
+                event_id=OuterRef('pk'),
+                group_id__in=Group.members.through.objects.filter(user_id=user_id).values('group_id')
+            )),
+        )
+
+    def visible_to(self, user):
+        """Public events plus those shared with the user or their groups (EXISTS, no DISTINCT)"""
+        return self.filter(
+            Q(is_public=True) |
+            Exists(Event.visible_to_users.through.objects.filter(event_id=OuterRef('pk'), user_id=user.id)) |
+            Exists(Event.visible_to_groups.through.objects.filter(
+                event_id=OuterRef('pk'),
+                group_id__in=Group.members.through.objects.filter(user_id=user.id).values('group_id')
+            )) |
+            Q(created_by=user)
+        )
 
 
 class Event(models.Model):
@@ -196,19 +465,27 @@ class Event(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = EventQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.title} - {self.date}"
 
     @property
     def total_rsvp_yes(self):
+        if hasattr(self, 'rsvp_yes_count_'):
+            return self.rsvp_yes_count_
         return self.rsvp_yes.count()
 
     @property
     def total_rsvp_no(self):
+        if hasattr(self, 'rsvp_no_count_'):
+            return self.rsvp_no_count_
         return self.rsvp_no.count()
 
     @property
     def total_rsvp_maybe(self):
+        if hasattr(self, 'rsvp_maybe_count_'):
+            return self.rsvp_maybe_count_
         return self.rsvp_maybe.count()
 
     @property
@@ -218,12 +495,28 @@ class Event(models.Model):
     @property
     def is_upcoming(self):
         """Check if event is upcoming"""
-        from datetime import datetime
-        event_datetime = datetime.combine(self.date, self.time)
-        return event_datetime > timezone.now()
+        if hasattr(self, 'is_upcoming_'):
+            return self.is_upcoming_
+        if self.date is None or self.time is None:
+            return False
+        # date/time are stored as local wall-clock values
+        now = timezone.localtime()
+        return (self.date, self.time) > (now.date(), now.time())
+
+    def _has_user_context(self, user):
+        return hasattr(self, '_ctx_user_id') and self._ctx_user_id == user.id
 
     def get_user_rsvp_status(self, user):
         """Get RSVP status for a specific user"""
+        if self._has_user_context(user):
+            if self._rsvp_yes:
+                return 'yes'
+            elif self._rsvp_no:
+                return 'no'
+            elif self._rsvp_maybe:
+                return 'maybe'
+            return None
+
         if self.rsvp_yes.filter(id=user.id).exists():
             return 'yes'
         elif self.rsvp_no.filter(id=user.id).exists():
@@ -236,17 +529,27 @@ class Event(models.Model):
         """Check if user can view this event"""
         if self.is_public:
             return True
-        if self.created_by == user:
+        if self.created_by_id == user.id:
             return True
+        if self._has_user_context(user):
+            return self._visible_user or self._visible_group
         if self.visible_to_users.filter(id=user.id).exists():
             return True
-        if self.visible_to_groups.filter(members=user).exists():
+        if Group.members.through.objects.filter(
+            user_id=user.id,
+            group_id__in=Event.visible_to_groups.through.objects.filter(event_id=self.pk).values('group_id')
+        ).exists():
             return True
         return False
 
     class Meta:
         db_table = 'communication_events'
         ordering = ['date', 'time']
+        indexes = [
+            models.Index(fields=['date', 'time']),
+            models.Index(fields=['is_important', 'date']),
+            models.Index(fields=['date'], name='event_active_idx', condition=Q(is_active=True)),
+        ]
 
 
 class BroadcastView(models.Model):
@@ -256,9 +559,21 @@ class BroadcastView(models.Model):
     viewed_at = models.DateTimeField(auto_now_add=True)
     ip_address = models.GenericIPAddressField(blank=True, null=True)
 
+    @classmethod
+    def log_views_bulk(cls, broadcast, users, ip=None):
+        """Record views for many users at once; existing (broadcast, user) rows are skipped"""
+        return cls.objects.bulk_create(
+            [cls(broadcast=broadcast, user=user, ip_address=ip) for user in users],
+            ignore_conflicts=True,
+            batch_size=1000
+        )
+
     class Meta:
         db_table = 'communication_broadcast_views'
         unique_together = ['broadcast', 'user']
+        indexes = [
+            models.Index(fields=['broadcast', 'viewed_at']),
+        ]
 
 
 class EventRSVPLog(models.Model):
@@ -269,5 +584,20 @@ class EventRSVPLog(models.Model):
     new_status = models.CharField(max_length=10, choices=Event.RSVP_STATUS)
     changed_at = models.DateTimeField(auto_now_add=True)
 
+    @classmethod
+    def log_bulk(cls, event, user_ids, new_status, old_status=None):
+        """Record the same RSVP change for many users in batched INSERTs"""
+        return cls.objects.bulk_create(
+            [
+                cls(event=event, user_id=user_id, old_status=old_status, new_status=new_status)
+                for user_id in user_ids
+            ],
+            batch_size=1000
+        )
+
     class Meta:
-        db_table = 'communication_event_rsvp_logs'
\ No newline at end of file
+        db_table = 'communication_event_rsvp_logs'
+        indexes = [
+            # Per-event analytics filter changed_at by plain datetime bounds
+            models.Index(fields=['event', 'changed_at']),
+        ]
\ No newline at end of file
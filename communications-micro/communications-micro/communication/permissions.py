@@ -2,6 +2,16 @@ from rest_framework.permissions import BasePermission
 from django.contrib.auth.models import User
 
 
+def _cached_exists(request, key, fn):
+    """Memoize a membership lookup for the lifetime of the request"""
+    cache = getattr(request, '_perm_cache', None)
+    if cache is None:
+        cache = request._perm_cache = {}
+    if key not in cache:
+        cache[key] = fn()
+    return cache[key]
+
+
 class IsAdminOrReadOnly(BasePermission):
     """
     Custom permission to only allow admins to edit objects.
@@ -27,22 +37,29 @@ class IsBroadcastOwnerOrAdmin(BasePermission):
     def has_object_permission(self, request, view, obj):
         # Read permissions for any authenticated user if they can see the broadcast
         if request.method in ['GET', 'HEAD', 'OPTIONS']:
-            return self.can_view_broadcast(request.user, obj)
+            return self.can_view_broadcast(request, obj)
         
         # Write permissions only for admins or broadcast owner
         return request.user.is_staff or obj.created_by == request.user
 
-    def can_view_broadcast(self, user, broadcast):
+    def can_view_broadcast(self, request, broadcast):
         """Check if user can view this broadcast"""
+        user = request.user
         if not broadcast.is_visible:
             return False
         
         if broadcast.audience_type == 'all':
             return True
         elif broadcast.audience_type == 'groups':
-            return broadcast.target_groups.filter(members=user).exists()
+            return _cached_exists(
+                request, ('broadcast_group', broadcast.pk, user.pk),
+                lambda: broadcast.user_in_target_groups(user)
+            )
         elif broadcast.audience_type == 'users':
-            return broadcast.target_users.filter(id=user.id).exists()
+            return _cached_exists(
+                request, ('broadcast_user', broadcast.pk, user.pk),
+                lambda: broadcast.target_users.filter(id=user.id).exists()
+            )
         
         return False
 
@@ -74,14 +91,26 @@ class IsGroupOwnerOrAdmin(BasePermission):
         # Read permissions for group members
         if request.method in ['GET', 'HEAD', 'OPTIONS']:
             return (obj.group_type == 'public' or 
-                   obj.members.filter(id=request.user.id).exists() or
-                   obj.owners.filter(id=request.user.id).exists() or
+                   self.is_member(request, obj) or
+                   self.is_owner(request, obj) or
                    request.user.is_staff)
         
         # Write permissions for group owners or admins
-        return (obj.owners.filter(id=request.user.id).exists() or 
+        return (self.is_owner(request, obj) or 
                request.user.is_staff)
 
+    def is_member(self, request, group):
+        return _cached_exists(
+            request, ('group_member', group.pk, request.user.pk),
+            lambda: group.members.filter(id=request.user.id).exists()
+        )
+
+    def is_owner(self, request, group):
+        return _cached_exists(
+            request, ('group_owner', group.pk, request.user.pk),
+            lambda: group.owners.filter(id=request.user.id).exists()
+        )
+
 
 class CanRSVPToEvent(BasePermission):
     """
@@ -109,9 +138,15 @@ class CanAcknowledgeBroadcast(BasePermission):
         if obj.audience_type == 'all':
             return True
         elif obj.audience_type == 'groups':
-            return obj.target_groups.filter(members=request.user).exists()
+            return _cached_exists(
+                request, ('broadcast_group', obj.pk, request.user.pk),
+                lambda: obj.user_in_target_groups(request.user)
+            )
         elif obj.audience_type == 'users':
-            return obj.target_users.filter(id=request.user.id).exists()
+            return _cached_exists(
+                request, ('broadcast_user', obj.pk, request.user.pk),
+                lambda: obj.target_users.filter(id=request.user.id).exists()
+            )
         
         return False
 
@@ -0,0 +1,23 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson when it is installed"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # Indented output (e.g. the browsable API) keeps the stdlib encoder
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Types orjson doesn't know (Decimal, lazy strings, ...) go through DRF's encoder;
+        # OPT_NON_STR_KEYS covers the int-keyed per-item errors of list fields
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=orjson.OPT_NON_STR_KEYS)
+        # Match JSONRenderer, which escapes these for JavaScript compatibility
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -1,8 +1,38 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Prefetch
 from django.utils import timezone
 from .models import Broadcast, Event, Media, Group, BroadcastView, EventRSVPLog
 
+# Upper bound on ids accepted per group/user targeting list
+MAX_M2M = 1000
+
+_STATUS_CHOICES = tuple((status, status) for status in ('yes', 'no', 'maybe'))
+
+
+def _clean_ids(model, ids):
+    """Check in one query that every id exists; unknown ids fail validation"""
+    if not ids:
+        return []
+    found = set(model.objects.filter(id__in=ids).values_list('id', flat=True))
+    missing = sorted(set(ids) - found)
+    if missing:
+        raise serializers.ValidationError(f'Unknown ids: {missing}')
+    return list(found)
+
+
+class UserContextModelSerializer(serializers.ModelSerializer):
+    """ModelSerializer that resolves the requesting user's id once per serializer tree"""
+
+    def get_context_user_id(self):
+        """Authenticated user id for this request, resolved once per serializer tree"""
+        context = self.context
+        if 'uid' not in context:
+            user = getattr(context.get('request'), 'user', None)
+            context['uid'] = user.id if user is not None and user.is_authenticated else None
+        return context['uid']
+
 
 class UserSerializer(serializers.ModelSerializer):
     """Basic user serializer"""
@@ -22,29 +52,31 @@ class MediaSerializer(serializers.ModelSerializer):
 
     def get_file_url(self, obj):
         if obj.file:
+            url = obj.file.url
+            # Host prefix resolved once per request by the viewset
+            prefix = self.context.get('abs_prefix')
+            if prefix is not None and url.startswith('/'):
+                return f"{prefix}{url}"
             request = self.context.get('request')
             if request:
-                return request.build_absolute_uri(obj.file.url)
+                return request.build_absolute_uri(url)
         return None
 
 
 class GroupSerializer(serializers.ModelSerializer):
     """Group serializer"""
-    members_count = serializers.SerializerMethodField()
+    members_count = serializers.ReadOnlyField()
     
     class Meta:
         model = Group
         fields = ['id', 'name', 'description', 'group_type', 'department', 'members_count', 'created_at']
         read_only_fields = ['created_at']
 
-    def get_members_count(self, obj):
-        return obj.members.count()
 
-
-class BroadcastListSerializer(serializers.ModelSerializer):
+class BroadcastListSerializer(UserContextModelSerializer):
     """Broadcast list serializer (minimal fields)"""
     created_by_name = serializers.SerializerMethodField()
-    attachments_count = serializers.SerializerMethodField()
+    attachments_count = serializers.ReadOnlyField()
     is_acknowledged = serializers.SerializerMethodField()
     is_viewed = serializers.SerializerMethodField()
     acknowledgment_rate = serializers.ReadOnlyField()
@@ -59,26 +91,32 @@ class BroadcastListSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        # Only the columns rendered above; skips the large description text
+        return queryset.only(
+            'id', 'title', 'priority', 'start_date', 'end_date', 'audience_type',
+            'is_published', 'is_active', 'send_email', 'created_by', 'created_at', 'updated_at'
+        ).with_created_by_name().with_attachments_count().with_ack_rate()
+
     def get_created_by_name(self, obj):
+        # Annotated by setup_eager_loading via with_created_by_name()
+        if hasattr(obj, 'created_by_name_'):
+            return obj.created_by_name_
         return f"{obj.created_by.first_name} {obj.created_by.last_name}".strip() or obj.created_by.username
 
-    def get_attachments_count(self, obj):
-        return obj.attachments.count()
-
     def get_is_acknowledged(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.acknowledged_by.filter(id=request.user.id).exists()
-        return False
+        if self.get_context_user_id() is None:
+            return False
+        return obj.is_acknowledged_by(self.context['request'].user)
 
     def get_is_viewed(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.viewed_by.filter(id=request.user.id).exists()
-        return False
+        if self.get_context_user_id() is None:
+            return False
+        return obj.is_viewed_by(self.context['request'].user)
 
 
-class BroadcastDetailSerializer(serializers.ModelSerializer):
+class BroadcastDetailSerializer(UserContextModelSerializer):
     """Broadcast detail serializer"""
     created_by = UserSerializer(read_only=True)
     attachments = MediaSerializer(many=True, read_only=True)
@@ -91,13 +129,15 @@ class BroadcastDetailSerializer(serializers.ModelSerializer):
     target_group_ids = serializers.ListField(
         child=serializers.IntegerField(),
         write_only=True,
-        required=False
+        required=False,
+        max_length=MAX_M2M
     )
     target_users = UserSerializer(many=True, read_only=True)
     target_user_ids = serializers.ListField(
         child=serializers.IntegerField(),
         write_only=True,
-        required=False
+        required=False,
+        max_length=MAX_M2M
     )
     acknowledgment_rate = serializers.ReadOnlyField()
     total_recipients = serializers.ReadOnlyField()
@@ -115,17 +155,32 @@ class BroadcastDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_by', 'created_at', 'updated_at']
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.with_ack_rate().select_related('created_by').prefetch_related(
+            'attachments', 'target_users',
+            Prefetch('target_groups', queryset=Group.objects.with_members_count()),
+        )
+
     def get_is_acknowledged(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.acknowledged_by.filter(id=request.user.id).exists()
-        return False
+        if self.get_context_user_id() is None:
+            return False
+        return obj.is_acknowledged_by(self.context['request'].user)
 
     def get_is_viewed(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.viewed_by.filter(id=request.user.id).exists()
-        return False
+        if self.get_context_user_id() is None:
+            return False
+        return obj.is_viewed_by(self.context['request'].user)
+
+    # Unknown ids fail here, before create()/update() write anything
+    def validate_attachment_ids(self, value):
+        return _clean_ids(Media, value)
+
+    def validate_target_group_ids(self, value):
+        return _clean_ids(Group, value)
+
+    def validate_target_user_ids(self, value):
+        return _clean_ids(User, value)
 
     def validate(self, data):
         """Validate broadcast data"""
@@ -141,6 +196,7 @@ class BroadcastDetailSerializer(serializers.ModelSerializer):
         
         return data
 
+    @transaction.atomic
     def create(self, validated_data):
         attachment_ids = validated_data.pop('attachment_ids', [])
         target_group_ids = validated_data.pop('target_group_ids', [])
@@ -149,15 +205,17 @@ class BroadcastDetailSerializer(serializers.ModelSerializer):
         validated_data['created_by'] = self.context['request'].user
         broadcast = Broadcast.objects.create(**validated_data)
         
+        # Nothing is linked yet, so add() skips the diff that set() performs
         if attachment_ids:
-            broadcast.attachments.set(attachment_ids)
+            broadcast.attachments.add(*attachment_ids)
         if target_group_ids:
-            broadcast.target_groups.set(target_group_ids)
+            broadcast.target_groups.add(*target_group_ids)
         if target_user_ids:
-            broadcast.target_users.set(target_user_ids)
+            broadcast.target_users.add(*target_user_ids)
         
         return broadcast
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         attachment_ids = validated_data.pop('attachment_ids', None)
         target_group_ids = validated_data.pop('target_group_ids', None)
@@ -177,7 +235,7 @@ class BroadcastDetailSerializer(serializers.ModelSerializer):
         return instance
 
 
-class EventListSerializer(serializers.ModelSerializer):
+class EventListSerializer(UserContextModelSerializer):
     """Event list serializer (minimal fields)"""
     created_by_name = serializers.SerializerMethodField()
     user_rsvp_status = serializers.SerializerMethodField()
@@ -192,17 +250,23 @@ class EventListSerializer(serializers.ModelSerializer):
             'created_at'
         ]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.with_created_by_name().with_rsvp_counts()
+
     def get_created_by_name(self, obj):
+        # Annotated by setup_eager_loading via with_created_by_name()
+        if hasattr(obj, 'created_by_name_'):
+            return obj.created_by_name_
         return f"{obj.created_by.first_name} {obj.created_by.last_name}".strip() or obj.created_by.username
 
     def get_user_rsvp_status(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.get_user_rsvp_status(request.user)
-        return None
+        if self.get_context_user_id() is None:
+            return None
+        return obj.get_user_rsvp_status(self.context['request'].user)
 
 
-class EventDetailSerializer(serializers.ModelSerializer):
+class EventDetailSerializer(UserContextModelSerializer):
     """Event detail serializer"""
     created_by = UserSerializer(read_only=True)
     media = MediaSerializer(many=True, read_only=True)
@@ -215,13 +279,15 @@ class EventDetailSerializer(serializers.ModelSerializer):
     visible_to_group_ids = serializers.ListField(
         child=serializers.IntegerField(),
         write_only=True,
-        required=False
+        required=False,
+        max_length=MAX_M2M
     )
     visible_to_users = UserSerializer(many=True, read_only=True)
     visible_to_user_ids = serializers.ListField(
         child=serializers.IntegerField(),
         write_only=True,
-        required=False
+        required=False,
+        max_length=MAX_M2M
     )
     user_rsvp_status = serializers.SerializerMethodField()
     total_rsvp_yes = serializers.ReadOnlyField()
@@ -242,21 +308,40 @@ class EventDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_by', 'created_at', 'updated_at']
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.with_rsvp_counts().select_related('created_by').prefetch_related(
+            'media', 'visible_to_users',
+            Prefetch('visible_to_groups', queryset=Group.objects.with_members_count()),
+        )
+
     def get_user_rsvp_status(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.get_user_rsvp_status(request.user)
-        return None
+        if self.get_context_user_id() is None:
+            return None
+        return obj.get_user_rsvp_status(self.context['request'].user)
+
+    # Unknown ids fail here, before create()/update() write anything
+    def validate_media_ids(self, value):
+        return _clean_ids(Media, value)
+
+    def validate_visible_to_group_ids(self, value):
+        return _clean_ids(Group, value)
+
+    def validate_visible_to_user_ids(self, value):
+        return _clean_ids(User, value)
 
     def validate(self, data):
         """Validate event data"""
-        from datetime import datetime
-        event_datetime = datetime.combine(data['date'], data['time'])
-        if event_datetime <= timezone.now():
+        # date/time are local wall-clock values; only today's events need the time check
+        today = timezone.localdate()
+        if data['date'] < today or (
+            data['date'] == today and data['time'] <= timezone.localtime().time()
+        ):
             raise serializers.ValidationError("Event date and time must be in the future")
         
         return data
 
+    @transaction.atomic
     def create(self, validated_data):
         media_ids = validated_data.pop('media_ids', [])
         visible_to_group_ids = validated_data.pop('visible_to_group_ids', [])
@@ -265,15 +350,17 @@ class EventDetailSerializer(serializers.ModelSerializer):
         validated_data['created_by'] = self.context['request'].user
         event = Event.objects.create(**validated_data)
         
+        # Nothing is linked yet, so add() skips the diff that set() performs
         if media_ids:
-            event.media.set(media_ids)
+            event.media.add(*media_ids)
         if visible_to_group_ids:
-            event.visible_to_groups.set(visible_to_group_ids)
+            event.visible_to_groups.add(*visible_to_group_ids)
         if visible_to_user_ids:
-            event.visible_to_users.set(visible_to_user_ids)
+            event.visible_to_users.add(*visible_to_user_ids)
         
         return event
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         media_ids = validated_data.pop('media_ids', None)
         visible_to_group_ids = validated_data.pop('visible_to_group_ids', None)
@@ -295,7 +382,7 @@ class EventDetailSerializer(serializers.ModelSerializer):
 
 class RSVPSerializer(serializers.Serializer):
     """RSVP action serializer"""
-    status = serializers.ChoiceField(choices=['yes', 'no', 'maybe'])
+    status = serializers.ChoiceField(choices=_STATUS_CHOICES)
 
 
 class BroadcastAcknowledgeSerializer(serializers.Serializer):
@@ -321,8 +408,9 @@ class BroadcastAnalyticsSerializer(serializers.Serializer):
     total_acknowledgments = serializers.IntegerField()
     acknowledgment_rate = serializers.FloatField()
     view_rate = serializers.FloatField()
-    daily_views = serializers.ListField()
-    daily_acknowledgments = serializers.ListField()
+    # Only present with ?include=daily
+    daily_views = serializers.ListField(required=False)
+    daily_acknowledgments = serializers.ListField(required=False)
 
 
 class EventAnalyticsSerializer(serializers.Serializer):
@@ -332,4 +420,4 @@ class EventAnalyticsSerializer(serializers.Serializer):
     total_rsvp_maybe = serializers.IntegerField()
     total_rsvp = serializers.IntegerField()
     rsvp_rate = serializers.FloatField()
-    daily_rsvp = serializers.ListField()
\ No newline at end of file
+    daily_rsvp = serializers.ListField(required=False)  # ?include=daily
\ No newline at end of file
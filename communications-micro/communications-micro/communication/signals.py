@@ -1,9 +1,62 @@
-from django.db.models.signals import post_save, m2m_changed
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.core.signals import setting_changed
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from django.core.mail import send_mail
+from django.core.cache import cache
+from django.core.mail import send_mass_mail
+from django.db import transaction
+from django.db.models import Exists, OuterRef
 from django.conf import settings
-from .models import Broadcast, Event, EventRSVPLog
+from django.utils import timezone
+from .models import (
+    Broadcast, BroadcastView, Event, EventRSVPLog, Group, Media, ACTIVE_USER_COUNT_KEY, bump_list_version
+)
+
+
+# User columns shown in broadcast/event payloads or counted as recipients
+USER_PAYLOAD_FIELDS = frozenset({'username', 'first_name', 'last_name', 'email', 'is_active'})
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    """Drop the cached active user count when users change"""
+    cache.delete(ACTIVE_USER_COUNT_KEY)
+    # Recipient totals and creator names in list payloads depend on users; a login's
+    # save(update_fields=['last_login']) touches neither, so it keeps clients' ETags valid
+    if update_fields is None or not USER_PAYLOAD_FIELDS.isdisjoint(update_fields):
+        bump_list_version('broadcast', 'event')
+
+
+@receiver([post_save, post_delete], sender=Broadcast)
+@receiver([post_save, post_delete], sender=BroadcastView)
+@receiver(m2m_changed, sender=Broadcast.acknowledged_by.through)
+@receiver(m2m_changed, sender=Broadcast.viewed_by.through)
+@receiver(m2m_changed, sender=Broadcast.target_users.through)
+@receiver(m2m_changed, sender=Broadcast.target_groups.through)
+@receiver(m2m_changed, sender=Broadcast.attachments.through)
+def broadcast_rows_changed(sender, **kwargs):
+    """Invalidate broadcast ETags when a broadcast or its relations change"""
+    bump_list_version('broadcast')
+
+
+@receiver([post_save, post_delete], sender=Event)
+@receiver(m2m_changed, sender=Event.rsvp_yes.through)
+@receiver(m2m_changed, sender=Event.rsvp_no.through)
+@receiver(m2m_changed, sender=Event.rsvp_maybe.through)
+@receiver(m2m_changed, sender=Event.visible_to_users.through)
+@receiver(m2m_changed, sender=Event.visible_to_groups.through)
+@receiver(m2m_changed, sender=Event.media.through)
+def event_rows_changed(sender, **kwargs):
+    """Invalidate event ETags when an event or its relations change"""
+    bump_list_version('event')
+
+
+@receiver([post_save, post_delete], sender=Group)
+@receiver([post_save, post_delete], sender=Media)
+@receiver(m2m_changed, sender=Group.members.through)
+def shared_rows_changed(sender, **kwargs):
+    """Group membership and media feed both kinds' visibility and payloads"""
+    bump_list_version('broadcast', 'event')
 
 
 @receiver(post_save, sender=Broadcast)
@@ -22,56 +75,64 @@ def broadcast_acknowledged(sender, instance, action, pk_set, **kwargs):
         pass
 
 
-@receiver(m2m_changed, sender=Event.rsvp_yes.through)
-def event_rsvp_yes_changed(sender, instance, action, pk_set, **kwargs):
-    """Handle RSVP Yes changes"""
-    if action == "post_add" and pk_set:
-        for user_id in pk_set:
-            try:
-                user = User.objects.get(id=user_id)
-                # Create RSVP log entry
-                EventRSVPLog.objects.create(
-                    event=instance,
-                    user=user,
-                    old_status=None,  # We don't track the old status in signals
-                    new_status='yes'
-                )
-            except User.DoesNotExist:
-                pass
+RSVP_THROUGH_STATUS = {
+    Event.rsvp_yes.through: 'yes',
+    Event.rsvp_no.through: 'no',
+    Event.rsvp_maybe.through: 'maybe',
+}
 
 
+@receiver(m2m_changed, sender=Event.rsvp_yes.through)
 @receiver(m2m_changed, sender=Event.rsvp_no.through)
-def event_rsvp_no_changed(sender, instance, action, pk_set, **kwargs):
-    """Handle RSVP No changes"""
-    if action == "post_add" and pk_set:
-        for user_id in pk_set:
-            try:
-                user = User.objects.get(id=user_id)
-                EventRSVPLog.objects.create(
-                    event=instance,
-                    user=user,
-                    old_status=None,
-                    new_status='no'
-                )
-            except User.DoesNotExist:
-                pass
+@receiver(m2m_changed, sender=Event.rsvp_maybe.through)
+def event_rsvp_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Log RSVP additions made outside EventViewSet.rsvp once the surrounding transaction commits"""
+    if action != "post_add" or not pk_set:
+        return
+    # The rsvp view writes the full old -> new transition itself
+    if getattr(instance, '_rsvp_logged_by_view', False):
+        return
 
+    new_status = RSVP_THROUGH_STATUS[sender]
+    # Forward adds carry user ids; user.events_rsvp_*.add() carries event ids
+    if reverse:
+        logs = [
+            EventRSVPLog(event_id=event_id, user_id=instance.pk, old_status=None, new_status=new_status)
+            for event_id in pk_set
+        ]
+    else:
+        logs = [
+            EventRSVPLog(event_id=instance.pk, user_id=user_id, old_status=None, new_status=new_status)
+            for user_id in pk_set
+        ]
+    transaction.on_commit(
+        lambda: EventRSVPLog.objects.bulk_create(logs, batch_size=500)
+    )
+
+
+MAIL_BATCH_SIZE = 500
+
+_FROM_EMAIL = settings.DEFAULT_FROM_EMAIL
 
-@receiver(m2m_changed, sender=Event.rsvp_maybe.through)
-def event_rsvp_maybe_changed(sender, instance, action, pk_set, **kwargs):
-    """Handle RSVP Maybe changes"""
-    if action == "post_add" and pk_set:
-        for user_id in pk_set:
-            try:
-                user = User.objects.get(id=user_id)
-                EventRSVPLog.objects.create(
-                    event=instance,
-                    user=user,
-                    old_status=None,
-                    new_status='maybe'
-                )
-            except User.DoesNotExist:
-                pass
+
+@receiver(setting_changed)
+def from_email_changed(setting, value, **kwargs):
+    """Keep the cached sender in step with override_settings"""
+    global _FROM_EMAIL
+    if setting == 'DEFAULT_FROM_EMAIL':
+        _FROM_EMAIL = value
+
+
+def send_in_batches(subject, message, recipients):
+    """Stream recipient emails and send one message each, MAIL_BATCH_SIZE per connection"""
+    batch = []
+    for email in recipients.exclude(email='').iterator(chunk_size=1000):
+        batch.append((subject, message, _FROM_EMAIL, [email]))
+        if len(batch) == MAIL_BATCH_SIZE:
+            send_mass_mail(batch, fail_silently=True)
+            batch.clear()
+    if batch:
+        send_mass_mail(batch, fail_silently=True)
 
 
 # Celery tasks (if using Celery for background tasks)
@@ -82,30 +143,38 @@ try:
     def send_broadcast_email(broadcast_id):
         """Send email notifications for broadcasts"""
         try:
-            broadcast = Broadcast.objects.get(id=broadcast_id)
+            broadcast = Broadcast.objects.only(
+                'id', 'title', 'description', 'audience_type', 'send_email', 'is_published', 'end_date'
+            ).get(id=broadcast_id)
+            
+            # Skip the recipient query if it was unpublished or expired before we ran
+            if not (broadcast.is_published and broadcast.send_email and broadcast.end_date >= timezone.now()):
+                return
             
             # Get recipients based on audience type
-            recipients = []
+            recipients = None
             if broadcast.audience_type == 'all':
                 recipients = User.objects.filter(is_active=True, email__isnull=False).values_list('email', flat=True)
             elif broadcast.audience_type == 'groups':
+                # EXISTS keeps one row per user without a JOIN + DISTINCT
+                in_target_group = Group.members.through.objects.filter(
+                    user_id=OuterRef('pk'),
+                    group_id__in=Broadcast.target_groups.through.objects.filter(
+                        broadcast_id=broadcast.id
+                    ).values('group_id')
+                )
                 recipients = User.objects.filter(
-                    user_groups__in=broadcast.target_groups.all(),
+                    Exists(in_target_group),
+                    is_active=True,
                     email__isnull=False
-                ).distinct().values_list('email', flat=True)
+                ).values_list('email', flat=True)
             elif broadcast.audience_type == 'users':
                 recipients = broadcast.target_users.filter(
                     email__isnull=False
                 ).values_list('email', flat=True)
             
-            if recipients:
-                send_mail(
-                    subject=f"[Broadcast] {broadcast.title}",
-                    message=broadcast.description,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=list(recipients),
-                    fail_silently=True,
-                )
+            if recipients is not None:
+                send_in_batches(f"[Broadcast] {broadcast.title}", broadcast.description, recipients)
                 
         except Broadcast.DoesNotExist:
             pass
@@ -114,23 +183,22 @@ try:
     def send_event_reminder(event_id):
         """Send event reminders"""
         try:
-            event = Event.objects.get(id=event_id)
+            event = Event.objects.only(
+                'id', 'title', 'description', 'date', 'time', 'venue'
+            ).get(id=event_id)
             
             # Get users who RSVP'd yes
             recipients = event.rsvp_yes.filter(email__isnull=False).values_list('email', flat=True)
             
-            if recipients:
-                send_mail(
-                    subject=f"[Event Reminder] {event.title}",
-                    message=f"This is a reminder for the upcoming event: {event.title}\n"
-                           f"Date: {event.date}\n"
-                           f"Time: {event.time}\n"
-                           f"Venue: {event.venue}\n\n"
-                           f"{event.description}",
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=list(recipients),
-                    fail_silently=True,
-                )
+            send_in_batches(
+                f"[Event Reminder] {event.title}",
+                f"This is a reminder for the upcoming event: {event.title}\n"
+                f"Date: {event.date}\n"
+                f"Time: {event.time}\n"
+                f"Venue: {event.venue}\n\n"
+                f"{event.description}",
+                recipients,
+            )
                 
         except Event.DoesNotExist:
             pass
@@ -1,34 +1,72 @@
-from django.test import TestCase
-from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User, update_last_login
+from django.core.cache import cache
 from django.utils import timezone
 from datetime import datetime, date, time, timedelta
-from rest_framework.test import APIClient
+from unittest import mock
+import json
+from rest_framework.test import APIClient, APIRequestFactory, APITestCase, force_authenticate
 from rest_framework import status
-from .models import Broadcast, Event, Group, Media
+from .models import Broadcast, Event, EventRSVPLog, Group, Media, active_user_count, list_version
+from .serializers import MediaSerializer
+from .views import BroadcastViewSet, EventViewSet, MediaViewSet
 
+TEST_PASSWORD = 'testpass123'
+# communications_project.urls mounts the app's router under /communications/
+API = '/communications/api'
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class BaseTestCase(APITestCase):
+    """APITestCase with a cheap password hasher so fixture users are fast to create"""
+    factory = APIRequestFactory()
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._authed = {}
 
-class BroadcastModelTest(TestCase):
     def setUp(self):
-        self.user = User.objects.create_user(
+        super().setUp()
+        # Cached counts and analytics are keyed by pk, which tests reuse
+        cache.clear()
+
+    def client_for(self, user):
+        """Return an APIClient authenticated as user, built once per class"""
+        client = self._authed.get(user.pk)
+        if client is None:
+            client = self._authed[user.pk] = APIClient()
+            client.force_authenticate(user=user)
+        return client
+
+
+class BroadcastModelTest(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
-            password='testpass123'
+            password=TEST_PASSWORD
         )
-        self.admin = User.objects.create_user(
+        cls.admin = User.objects.create_user(
             username='admin',
             email='admin@example.com',
-            password='adminpass123',
+            password=TEST_PASSWORD,
             is_staff=True
         )
 
     def test_broadcast_creation(self):
         """Test broadcast model creation"""
+        now = timezone.now()
         broadcast = Broadcast.objects.create(
             title='Test Broadcast',
             description='This is a test broadcast',
             priority='important',
-            start_date=timezone.now(),
-            end_date=timezone.now() + timedelta(hours=24),
+            start_date=now,
+            end_date=now + timedelta(hours=24),
             audience_type='all',
             created_by=self.user
         )
@@ -64,35 +102,70 @@ class BroadcastModelTest(TestCase):
         
         self.assertTrue(visible_broadcast.is_visible)
         self.assertFalse(future_broadcast.is_visible)
+        self.assertEqual(list(Broadcast.objects.visible()), [visible_broadcast])
+        
+        # A reused instance follows later changes
+        visible_broadcast.is_active = False
+        self.assertFalse(visible_broadcast.is_visible)
+        future_broadcast.start_date = now - timedelta(hours=1)
+        self.assertTrue(future_broadcast.is_visible)
 
     def test_acknowledgment_rate(self):
         """Test acknowledgment rate calculation"""
+        now = timezone.now()
+        # Create additional users
+        user2 = User.objects.create_user(username='user2', email='user2@example.com')
+        user3 = User.objects.create_user(username='user3', email='user3@example.com')
+        
+        # Target three users explicitly; audience 'all' would also count the admin
         broadcast = Broadcast.objects.create(
             title='Test Broadcast',
             description='Test',
-            start_date=timezone.now(),
-            end_date=timezone.now() + timedelta(hours=24),
-            audience_type='all',
+            start_date=now,
+            end_date=now + timedelta(hours=24),
+            audience_type='users',
             created_by=self.user
         )
-        
-        # Create additional users
-        user2 = User.objects.create_user(username='user2', email='user2@example.com')
-        user3 = User.objects.create_user(username='user3', email='user3@example.com')
+        broadcast.target_users.add(self.user, user2, user3)
         
         # Acknowledge by 2 out of 3 users
         broadcast.acknowledged_by.add(self.user, user2)
         
-        # Should be 66.67% (2/3 * 100)
+        # Should be 66.67% (2/3 * 100), in Python and from the SQL annotation
         self.assertAlmostEqual(broadcast.acknowledgment_rate, 66.67, places=1)
+        annotated = Broadcast.objects.with_ack_rate().get(pk=broadcast.pk)
+        self.assertAlmostEqual(annotated.acknowledgment_rate, 66.67, places=1)
+
+    def test_acknowledgment_rate_tracks_changes(self):
+        """A reused instance reports new acks and targets rather than a stale rate"""
+        now = timezone.now()
+        broadcast = Broadcast.objects.create(
+            title='Test Broadcast',
+            description='Test',
+            start_date=now,
+            end_date=now + timedelta(hours=24),
+            audience_type='users',
+            created_by=self.user
+        )
+        broadcast.target_users.add(self.user, self.admin)
+        self.assertEqual(broadcast.total_recipients, 2)
+        self.assertEqual(broadcast.acknowledgment_rate, 0)
+        
+        broadcast.acknowledged_by.add(self.user)
+        self.assertEqual(broadcast.acknowledgment_rate, 50)
+        
+        broadcast.target_users.remove(self.admin)
+        self.assertEqual(broadcast.total_recipients, 1)
+        self.assertEqual(broadcast.acknowledgment_rate, 100)
 
 
-class EventModelTest(TestCase):
-    def setUp(self):
-        self.user = User.objects.create_user(
+class EventModelTest(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
-            password='testpass123'
+            password=TEST_PASSWORD
         )
 
     def test_event_creation(self):
@@ -126,10 +199,11 @@ class EventModelTest(TestCase):
         user2 = User.objects.create_user(username='user2')
         user3 = User.objects.create_user(username='user3')
         
-        # Add RSVP responses
-        event.rsvp_yes.add(self.user)
-        event.rsvp_no.add(user2)
-        event.rsvp_maybe.add(user3)
+        # Add RSVP responses in one transaction
+        with transaction.atomic():
+            event.rsvp_yes.add(self.user)
+            event.rsvp_no.add(user2)
+            event.rsvp_maybe.add(user3)
         
         self.assertEqual(event.total_rsvp_yes, 1)
         self.assertEqual(event.total_rsvp_no, 1)
@@ -142,94 +216,181 @@ class EventModelTest(TestCase):
         self.assertEqual(event.get_user_rsvp_status(user3), 'maybe')
 
 
-class BroadcastAPITest(TestCase):
-    def setUp(self):
-        self.client = APIClient()
-        self.user = User.objects.create_user(
+class BroadcastAPITest(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
-            password='testpass123'
+            password=TEST_PASSWORD
         )
-        self.admin = User.objects.create_user(
+        cls.admin = User.objects.create_user(
             username='admin',
             email='admin@example.com',
-            password='adminpass123',
+            password=TEST_PASSWORD,
             is_staff=True
         )
 
     def test_broadcast_list_requires_authentication(self):
         """Test that broadcast list requires authentication"""
-        response = self.client.get('/api/broadcasts/')
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get(f'{API}/broadcasts/')
+        # SessionAuthentication comes first in DRF's defaults and sends no
+        # WWW-Authenticate challenge, so anonymous requests get 403 rather than 401
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
     def test_broadcast_list_authenticated(self):
         """Test broadcast list for authenticated user"""
-        self.client.force_authenticate(user=self.user)
-        response = self.client.get('/api/broadcasts/')
+        now = timezone.now()
+        Broadcast.objects.bulk_create([
+            Broadcast(
+                title=f'Broadcast {i}',
+                description='Test',
+                start_date=now,
+                end_date=now + timedelta(hours=24),
+                audience_type='all',
+                is_published=True,
+                created_by=self.admin
+            )
+            for i in range(3)
+        ])
+        active_user_count()  # cached recipient count, keep it out of the tally
+        
+        client = self.client_for(self.user)
+        # The list is unpaginated: one query for every row, however many broadcasts are listed
+        with self.assertNumQueries(1):
+            response = client.get(f'{API}/broadcasts/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
     def test_broadcast_creation(self):
         """Test broadcast creation via API"""
-        self.client.force_authenticate(user=self.admin)
+        now = timezone.now()
+        client = self.client_for(self.admin)
         
         data = {
             'title': 'API Test Broadcast',
             'description': 'Created via API',
             'priority': 'normal',
-            'start_date': timezone.now().isoformat(),
-            'end_date': (timezone.now() + timedelta(hours=24)).isoformat(),
+            'start_date': now.isoformat(),
+            'end_date': (now + timedelta(hours=24)).isoformat(),
             'audience_type': 'all',
             'send_email': False
         }
         
-        response = self.client.post('/api/broadcasts/', data, format='json')
+        response = client.post(f'{API}/broadcasts/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(Broadcast.objects.count(), 1)
+        self.assertIn('id', response.data)
+        self.assertEqual(response.data['title'], 'API Test Broadcast')
+
+    def test_broadcast_creation_rejects_unknown_targets(self):
+        """Unknown target ids fail validation instead of being dropped"""
+        now = timezone.now()
+        client = self.client_for(self.admin)
+        
+        data = {
+            'title': 'Typo Broadcast',
+            'description': 'Targets a user that does not exist',
+            'start_date': now.isoformat(),
+            'end_date': (now + timedelta(hours=24)).isoformat(),
+            'audience_type': 'users',
+            'target_user_ids': [self.user.id, 999999],
+            'send_email': False
+        }
+        
+        response = client.post(f'{API}/broadcasts/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('999999', str(response.data['target_user_ids']))
+        self.assertFalse(Broadcast.objects.filter(title='Typo Broadcast').exists())
+
+    def test_broadcast_update_rejects_unknown_targets_before_writing(self):
+        """Unknown ids on update fail validation before the broadcast row is saved"""
+        now = timezone.now()
+        broadcast = Broadcast.objects.create(
+            title='Original Title',
+            description='Test',
+            start_date=now,
+            end_date=now + timedelta(hours=24),
+            audience_type='users',
+            created_by=self.admin
+        )
+        client = self.client_for(self.admin)
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = client.patch(
+                f'{API}/broadcasts/{broadcast.id}/',
+                {'title': 'Renamed', 'target_user_ids': [999999]},
+                format='json'
+            )
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('999999', str(response.data['target_user_ids']))
+        self.assertFalse([q for q in queries.captured_queries if q['sql'].startswith('UPDATE')])
+        broadcast.refresh_from_db()
+        self.assertEqual(broadcast.title, 'Original Title')
+
+    def test_broadcast_creation_rejects_invalid_list_items(self):
+        """Per-item list errors (int-keyed) render as a 400, not a 500"""
+        now = timezone.now()
+        client = self.client_for(self.admin)
+        
+        data = {
+            'title': 'Bad Ids',
+            'description': 'Test',
+            'start_date': now.isoformat(),
+            'end_date': (now + timedelta(hours=24)).isoformat(),
+            'audience_type': 'users',
+            'target_user_ids': ['abc'],
+            'send_email': False
+        }
+        
+        response = client.post(f'{API}/broadcasts/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('0', response.json()['target_user_ids'])
 
     def test_broadcast_acknowledgment(self):
         """Test broadcast acknowledgment via API"""
+        now = timezone.now()
         broadcast = Broadcast.objects.create(
             title='Test Broadcast',
             description='Test',
-            start_date=timezone.now(),
-            end_date=timezone.now() + timedelta(hours=24),
+            start_date=now,
+            end_date=now + timedelta(hours=24),
             audience_type='all',
             is_published=True,
             created_by=self.admin
         )
         
-        self.client.force_authenticate(user=self.user)
-        
-        # Acknowledge broadcast
-        response = self.client.post(
-            f'/api/broadcasts/{broadcast.id}/acknowledge/',
+        # Acknowledge broadcast, calling the action directly (no URL routing/middleware)
+        view = BroadcastViewSet.as_view({'post': 'acknowledge'}, **BroadcastViewSet.acknowledge.kwargs)
+        request = self.factory.post(
+            f'{API}/broadcasts/{broadcast.id}/acknowledge/',
             {'acknowledged': True},
             format='json'
         )
+        force_authenticate(request, user=self.user)
+        response = view(request, pk=broadcast.id)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        broadcast.refresh_from_db()
-        self.assertTrue(broadcast.acknowledged_by.filter(id=self.user.id).exists())
+        self.assertIs(response.data['acknowledged'], True)
 
 
-class EventAPITest(TestCase):
-    def setUp(self):
-        self.client = APIClient()
-        self.user = User.objects.create_user(
+class EventAPITest(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
-            password='testpass123'
+            password=TEST_PASSWORD
         )
-        self.admin = User.objects.create_user(
+        cls.admin = User.objects.create_user(
             username='admin',
             email='admin@example.com',
-            password='adminpass123',
+            password=TEST_PASSWORD,
             is_staff=True
         )
 
     def test_event_creation(self):
         """Test event creation via API"""
-        self.client.force_authenticate(user=self.admin)
+        client = self.client_for(self.admin)
         
         data = {
             'title': 'API Test Event',
@@ -241,9 +402,10 @@ class EventAPITest(TestCase):
             'is_public': True
         }
         
-        response = self.client.post('/api/events/', data, format='json')
+        response = client.post(f'{API}/events/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(Event.objects.count(), 1)
+        self.assertIn('id', response.data)
+        self.assertEqual(response.data['title'], 'API Test Event')
 
     def test_event_rsvp(self):
         """Test event RSVP via API"""
@@ -257,56 +419,226 @@ class EventAPITest(TestCase):
             created_by=self.admin
         )
         
-        self.client.force_authenticate(user=self.user)
-        
-        # RSVP to event
-        response = self.client.post(
-            f'/api/events/{event.id}/rsvp/',
+        # RSVP to event, calling the action directly (no URL routing/middleware)
+        view = EventViewSet.as_view({'post': 'rsvp'}, **EventViewSet.rsvp.kwargs)
+        request = self.factory.post(
+            f'{API}/events/{event.id}/rsvp/',
             {'status': 'yes'},
             format='json'
         )
+        force_authenticate(request, user=self.user)
+        response = view(request, pk=event.id)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         event.refresh_from_db()
         self.assertTrue(event.rsvp_yes.filter(id=self.user.id).exists())
 
+    def test_event_rsvp_change_history(self):
+        """Changing yes -> no logs exactly the two transitions"""
+        event = Event.objects.create(
+            title='Test Event',
+            description='Test',
+            date=date.today() + timedelta(days=7),
+            time=time(14, 30),
+            venue='Conference Room',
+            is_public=True,
+            created_by=self.admin
+        )
+        
+        client = self.client_for(self.user)
+        # Run on_commit hooks so any signal-side logging would show up too
+        with self.captureOnCommitCallbacks(execute=True):
+            client.post(f'{API}/events/{event.id}/rsvp/', {'status': 'yes'}, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(f'{API}/events/{event.id}/rsvp/', {'status': 'no'}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        history = list(
+            EventRSVPLog.objects.filter(event=event).order_by('id').values_list('old_status', 'new_status')
+        )
+        self.assertEqual(history, [(None, 'yes'), ('yes', 'no')])
+
+    def test_event_rsvp_again_after_removal_is_logged(self):
+        """A second first-time RSVP with the same status keeps its own history row"""
+        event = Event.objects.create(
+            title='Test Event',
+            description='Test',
+            date=date.today() + timedelta(days=7),
+            time=time(14, 30),
+            venue='Conference Room',
+            is_public=True,
+            created_by=self.admin
+        )
+        
+        client = self.client_for(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            client.post(f'{API}/events/{event.id}/rsvp/', {'status': 'yes'}, format='json')
+        # An admin takes the user off the list; they RSVP yes again
+        event.rsvp_yes.remove(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            client.post(f'{API}/events/{event.id}/rsvp/', {'status': 'yes'}, format='json')
+        
+        history = list(
+            EventRSVPLog.objects.filter(event=event).order_by('id').values_list('old_status', 'new_status')
+        )
+        self.assertEqual(history, [(None, 'yes'), (None, 'yes')])
+
+    def test_rsvp_list_bucket_is_paginated(self):
+        """?status= returns one page of the bucket with count/next links"""
+        event = Event.objects.create(
+            title='Big Event',
+            description='Test',
+            date=date.today() + timedelta(days=7),
+            time=time(14, 30),
+            venue='Hall',
+            is_public=True,
+            created_by=self.admin
+        )
+        attendees = User.objects.bulk_create([
+            User(username=f'attendee{i}', password='!') for i in range(150)
+        ], batch_size=500)
+        event.rsvp_yes.add(*attendees)
+        
+        client = self.client_for(self.admin)
+        response = client.get(f'{API}/events/{event.id}/rsvp_list/', {'status': 'yes'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 150)
+        self.assertEqual(len(response.data['results']), 100)
+        self.assertIsNotNone(response.data['next'])
+        
+        response = client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 50)
+        self.assertIsNone(response.data['next'])
+
+    def test_event_analytics_cache_requires_shared_cache(self):
+        """Analytics are cached only with a shared cache; otherwise every read is fresh"""
+        event = Event.objects.create(
+            title='Test Event',
+            description='Test',
+            date=date.today() + timedelta(days=7),
+            time=time(14, 30),
+            venue='Conference Room',
+            is_public=True,
+            created_by=self.admin
+        )
+        client = self.client_for(self.admin)
+        url = f'{API}/events/{event.id}/analytics/'
+        
+        # Per-process cache: an out-of-band change shows up on the next read
+        self.assertEqual(client.get(url).data['total_rsvp'], 0)
+        event.rsvp_yes.add(self.user)
+        self.assertEqual(client.get(url).data['total_rsvp'], 1)
+        
+        with override_settings(SHARED_CACHE=True):
+            client.get(url)
+            event.rsvp_no.add(self.admin)
+            # Cached until an API write invalidates it
+            self.assertEqual(client.get(url).data['total_rsvp'], 1)
+            client.post(f'{API}/events/{event.id}/rsvp/', {'status': 'maybe'}, format='json')
+            self.assertEqual(client.get(url).data['total_rsvp'], 2)
+
     def test_upcoming_events(self):
         """Test upcoming events endpoint"""
+        today = date.today()
         # Create past and future events
+        Event.objects.bulk_create([
+            Event(
+                title='Past Event',
+                description='Past',
+                date=today - timedelta(days=1),
+                time=time(14, 30),
+                venue='Past Venue',
+                is_public=True,
+                created_by=self.admin
+            ),
+            Event(
+                title='Future Event',
+                description='Future',
+                date=today + timedelta(days=7),
+                time=time(14, 30),
+                venue='Future Venue',
+                is_public=True,
+                created_by=self.admin
+            ),
+        ], batch_size=500)
+        
+        client = self.client_for(self.user)
+        # The rows, then one prefetch each for media/users/groups
+        with self.assertNumQueries(4):
+            response = client.get(f'{API}/events/upcoming/')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)  # Only future event
+        self.assertEqual(response.data[0]['title'], 'Future Event')
+
+    @override_settings(SHARED_CACHE=True)
+    def test_upcoming_events_conditional_get(self):
+        """A matching If-None-Match gets a bodyless 304 until an event changes"""
+        client = self.client_for(self.user)
+        response = client.get(f'{API}/events/upcoming/')
+        etag = response['ETag']
+        
+        with self.assertNumQueries(0):
+            response = client.get(f'{API}/events/upcoming/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(response.content)
+        
+        # Signing in only updates last_login, which no payload shows
+        update_last_login(None, self.user)
+        response = client.get(f'{API}/events/upcoming/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
         Event.objects.create(
-            title='Past Event',
-            description='Past',
-            date=date.today() - timedelta(days=1),
-            time=time(14, 30),
-            venue='Past Venue',
+            title='New Event',
+            description='New',
+            date=date.today() + timedelta(days=1),
+            time=time(9, 0),
+            venue='Venue',
             is_public=True,
             created_by=self.admin
         )
-        
-        Event.objects.create(
-            title='Future Event',
-            description='Future',
+        response = client.get(f'{API}/events/upcoming/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+
+    @override_settings(SHARED_CACHE=True)
+    def test_event_analytics_conditional_get_checks_object(self):
+        """Analytics only answers 304 after loading the event through the permission-filtered queryset"""
+        event = Event.objects.create(
+            title='Test Event',
+            description='Test',
             date=date.today() + timedelta(days=7),
             time=time(14, 30),
-            venue='Future Venue',
+            venue='Conference Room',
             is_public=True,
             created_by=self.admin
         )
+        client = self.client_for(self.user)
+        url = f'{API}/events/{event.id}/analytics/'
+        etag = client.get(url)['ETag']
         
-        self.client.force_authenticate(user=self.user)
-        response = self.client.get('/api/events/upcoming/')
+        with self.assertNumQueries(1):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
         
+        Event.objects.filter(pk=event.pk).update(is_public=False)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_upcoming_events_without_shared_cache_has_no_etag(self):
+        """Per-process caches can't keep ETags consistent across workers, so none are sent"""
+        response = self.client_for(self.user).get(f'{API}/events/upcoming/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data['results']), 1)  # Only future event
-        self.assertEqual(response.data['results'][0]['title'], 'Future Event')
+        self.assertFalse(response.has_header('ETag'))
 
 
-class GroupModelTest(TestCase):
-    def setUp(self):
-        self.user = User.objects.create_user(
+class GroupModelTest(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
-            password='testpass123'
+            password=TEST_PASSWORD
         )
 
     def test_group_creation(self):
@@ -344,12 +676,13 @@ class GroupModelTest(TestCase):
         self.assertTrue(group.owners.filter(id=self.user.id).exists())
 
 
-class MediaModelTest(TestCase):
-    def setUp(self):
-        self.user = User.objects.create_user(
+class MediaModelTest(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
-            password='testpass123'
+            password=TEST_PASSWORD
         )
 
     def test_media_creation(self):
@@ -368,73 +701,100 @@ class MediaModelTest(TestCase):
         self.assertEqual(media.uploaded_by, self.user)
 
 
-class IntegrationTest(TestCase):
-    def setUp(self):
-        self.client = APIClient()
-        self.admin = User.objects.create_user(
-            username='admin',
-            email='admin@example.com',
-            password='adminpass123',
-            is_staff=True
-        )
-        self.user1 = User.objects.create_user(
-            username='user1',
-            email='user1@example.com',
-            password='pass123'
-        )
-        self.user2 = User.objects.create_user(
-            username='user2',
-            email='user2@example.com',
-            password='pass123'
+class MediaAPITest(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password=TEST_PASSWORD
         )
+        Media.objects.bulk_create([
+            Media(file_name=f'file{i}.jpg', file_type='image', file_size=1024, uploaded_by=cls.user)
+            for i in range(5)
+        ])
+
+    def test_media_list_streams_only_on_request(self):
+        """Plain list is a normal response; ?stream=1 streams the same JSON array"""
+        client = self.client_for(self.user)
+        response = client.get(f'{API}/media/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.streaming)
+        self.assertEqual(len(response.data), 5)
+        
+        with mock.patch.object(MediaViewSet, 'stream_chunk_size', 2):
+            streamed = client.get(f'{API}/media/?stream=1')
+        self.assertTrue(streamed.streaming)
+        rows = json.loads(b''.join(streamed.streaming_content))
+        self.assertEqual([row['id'] for row in rows], [row['id'] for row in response.data])
+
+    def test_media_stream_errors(self):
+        """A failure in the first chunk raises before streaming; a later one aborts the body"""
+        client = self.client_for(self.user)
+        with mock.patch.object(MediaSerializer, 'get_file_url', side_effect=ValueError('boom')):
+            with self.assertRaises(ValueError):
+                client.get(f'{API}/media/?stream=1')
+        
+        # The first chunk of two rows renders; the third row, in the second chunk, fails
+        with mock.patch.object(MediaViewSet, 'stream_chunk_size', 2), \
+                mock.patch.object(MediaSerializer, 'get_file_url', side_effect=[None, None, ValueError('boom')]):
+            response = client.get(f'{API}/media/?stream=1')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            with self.assertRaises(ValueError):
+                b''.join(response.streaming_content)
+
+
+class IntegrationTest(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Hash once and insert all users in a single statement
+        password = make_password(TEST_PASSWORD)
+        cls.admin, cls.user1, cls.user2 = User.objects.bulk_create([
+            User(username='admin', email='admin@example.com', password=password, is_staff=True),
+            User(username='user1', email='user1@example.com', password=password),
+            User(username='user2', email='user2@example.com', password=password),
+        ], batch_size=500)
 
     def test_broadcast_to_group_workflow(self):
         """Test complete workflow: create group, add members, broadcast to group"""
-        self.client.force_authenticate(user=self.admin)
-        
-        # 1. Create a group
-        group_data = {
-            'name': 'Engineering Team',
-            'description': 'Engineering department group',
-            'group_type': 'public',
-            'department': 'Engineering'
-        }
-        
-        response = self.client.post('/api/groups/', group_data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        group_id = response.data['id']
+        now = timezone.now()
         
-        # 2. Add members to group (through admin interface or API)
-        group = Group.objects.get(id=group_id)
+        # 1. Create a group and 2. add members (setup only, so straight through the ORM)
+        group = Group.objects.create(
+            name='Engineering Team',
+            description='Engineering department group',
+            group_type='public',
+            department='Engineering',
+            created_by=self.admin
+        )
         group.members.add(self.user1, self.user2)
         
         # 3. Create broadcast targeting the group
-        broadcast_data = {
-            'title': 'Engineering Announcement',
-            'description': 'Important update for engineering team',
-            'priority': 'important',
-            'start_date': timezone.now().isoformat(),
-            'end_date': (timezone.now() + timedelta(hours=24)).isoformat(),
-            'audience_type': 'groups',
-            'target_group_ids': [group_id],
-            'send_email': False
-        }
-        
-        response = self.client.post('/api/broadcasts/', broadcast_data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        broadcast_id = response.data['id']
+        broadcast = Broadcast.objects.create(
+            title='Engineering Announcement',
+            description='Important update for engineering team',
+            priority='important',
+            start_date=now,
+            end_date=now + timedelta(hours=24),
+            audience_type='groups',
+            is_published=True,
+            send_email=False,
+            created_by=self.admin
+        )
+        broadcast.target_groups.add(group)
+        broadcast_id = broadcast.id
         
         # 4. Verify group members can see the broadcast
-        self.client.force_authenticate(user=self.user1)
-        response = self.client.get('/api/broadcasts/')
+        client = self.client_for(self.user1)
+        response = client.get(f'{API}/broadcasts/')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        broadcast_titles = [b['title'] for b in response.data['results']]
+        broadcast_titles = [b['title'] for b in response.data]
         self.assertIn('Engineering Announcement', broadcast_titles)
         
         # 5. Test acknowledgment
-        response = self.client.post(
-            f'/api/broadcasts/{broadcast_id}/acknowledge/',
+        response = client.post(
+            f'{API}/broadcasts/{broadcast_id}/acknowledge/',
             {'acknowledged': True},
             format='json'
         )
@@ -443,45 +803,41 @@ class IntegrationTest(TestCase):
 
     def test_event_rsvp_workflow(self):
         """Test complete event workflow: create event, users RSVP, check analytics"""
-        self.client.force_authenticate(user=self.admin)
-        
-        # 1. Create an event
-        event_data = {
-            'title': 'Team Building Event',
-            'description': 'Fun team building activities',
-            'date': (date.today() + timedelta(days=14)).isoformat(),
-            'time': '10:00:00',
-            'venue': 'Company Auditorium',
-            'event_type': 'internal',
-            'is_public': True,
-            'is_important': True
-        }
-        
-        response = self.client.post('/api/events/', event_data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        event_id = response.data['id']
+        # 1. Create an event (setup only, so straight through the ORM)
+        event = Event.objects.create(
+            title='Team Building Event',
+            description='Fun team building activities',
+            date=date.today() + timedelta(days=14),
+            time=time(10, 0),
+            venue='Company Auditorium',
+            event_type='internal',
+            is_public=True,
+            is_important=True,
+            created_by=self.admin
+        )
+        event_id = event.id
         
         # 2. User1 RSVPs Yes
-        self.client.force_authenticate(user=self.user1)
-        response = self.client.post(
-            f'/api/events/{event_id}/rsvp/',
+        client = self.client_for(self.user1)
+        response = client.post(
+            f'{API}/events/{event_id}/rsvp/',
             {'status': 'yes'},
             format='json'
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
         # 3. User2 RSVPs Maybe
-        self.client.force_authenticate(user=self.user2)
-        response = self.client.post(
-            f'/api/events/{event_id}/rsvp/',
+        client = self.client_for(self.user2)
+        response = client.post(
+            f'{API}/events/{event_id}/rsvp/',
             {'status': 'maybe'},
             format='json'
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
         # 4. Check analytics (admin only)
-        self.client.force_authenticate(user=self.admin)
-        response = self.client.get(f'/api/events/{event_id}/analytics/')
+        client = self.client_for(self.admin)
+        response = client.get(f'{API}/events/{event_id}/analytics/')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['total_rsvp_yes'], 1)
@@ -489,7 +845,7 @@ class IntegrationTest(TestCase):
         self.assertEqual(response.data['total_rsvp'], 2)
         
         # 5. Check RSVP list
-        response = self.client.get(f'/api/events/{event_id}/rsvp_list/')
+        response = client.get(f'{API}/events/{event_id}/rsvp_list/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['yes']), 1)
         self.assertEqual(len(response.data['maybe']), 1)
@@ -497,38 +853,58 @@ class IntegrationTest(TestCase):
 
     def test_permissions_workflow(self):
         """Test permission system works correctly"""
-        self.client.force_authenticate(user=self.admin)
-        
-        # 1. Admin creates private group
-        group = Group.objects.create(
-            name='Private Group',
-            group_type='private',
-            created_by=self.admin
-        )
-        group.members.add(self.user1)  # Only user1 is member
-        
-        # 2. Admin creates broadcast for private group
-        broadcast = Broadcast.objects.create(
-            title='Private Announcement',
-            description='Only for private group members',
-            start_date=timezone.now(),
-            end_date=timezone.now() + timedelta(hours=24),
-            audience_type='groups',
-            is_published=True,
-            created_by=self.admin
-        )
-        broadcast.target_groups.add(group)
+        now = timezone.now()
+        client = self.client_for(self.admin)
+        
+        # Fixture rows for steps 1-2 go in one transaction
+        with transaction.atomic():
+            # 1. Admin creates private group
+            group = Group.objects.create(
+                name='Private Group',
+                group_type='private',
+                created_by=self.admin
+            )
+            group.members.add(self.user1)  # Only user1 is member
+            
+            # 2. Admin creates broadcast for private group
+            broadcast = Broadcast.objects.create(
+                title='Private Announcement',
+                description='Only for private group members',
+                start_date=now,
+                end_date=now + timedelta(hours=24),
+                audience_type='groups',
+                is_published=True,
+                created_by=self.admin
+            )
+            broadcast.target_groups.add(group)
+        active_user_count()
         
         # 3. User1 (group member) should see the broadcast
-        self.client.force_authenticate(user=self.user1)
-        response = self.client.get('/api/broadcasts/')
+        client = self.client_for(self.user1)
+        with self.assertNumQueries(1):
+            response = client.get(f'{API}/broadcasts/')
         
-        broadcast_titles = [b['title'] for b in response.data['results']]
+        broadcast_titles = [b['title'] for b in response.data]
         self.assertIn('Private Announcement', broadcast_titles)
         
         # 4. User2 (not a group member) should NOT see the broadcast
-        self.client.force_authenticate(user=self.user2)
-        response = self.client.get('/api/broadcasts/')
-        
-        broadcast_titles = [b['title'] for b in response.data['results']]
-        self.assertNotIn('Private Announcement', broadcast_titles)
\ No newline at end of file
+        client = self.client_for(self.user2)
+        # Same single query; it just matches nothing
+        with self.assertNumQueries(1):
+            response = client.get(f'{API}/broadcasts/')
+        
+        broadcast_titles = [b['title'] for b in response.data]
+        self.assertNotIn('Private Announcement', broadcast_titles)
+
+    def test_join_group_is_idempotent_and_invalidates_lists(self):
+        """Joining twice adds one membership; each join bumps the list versions"""
+        group = Group.objects.create(name='Open Group', group_type='public', created_by=self.admin)
+        client = self.client_for(self.admin)
+        
+        for _ in range(2):
+            before = list_version('broadcast'), list_version('event')
+            response = client.post(f'{API}/groups/{group.id}/join/')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual((list_version('broadcast'), list_version('event')), before)
+        
+        self.assertEqual(list(group.members.values_list('id', flat=True)), [self.admin.id])
@@ -23,20 +23,20 @@ urlpatterns = [
 # GET/PUT/PATCH/DELETE /api/broadcasts/{id}/               - Retrieve/Update/Delete broadcast
 # POST         /api/broadcasts/{id}/acknowledge/          - Acknowledge broadcast
 # POST         /api/broadcasts/{id}/mark_viewed/          - Mark broadcast as viewed
-# GET          /api/broadcasts/{id}/analytics/            - Get broadcast analytics
+# GET          /api/broadcasts/{id}/analytics/            - Get broadcast analytics (?include=daily adds the 30-day series)
 # GET          /api/broadcasts/my_broadcasts/             - Get user's broadcasts
 
 # GET/POST     /api/events/                               - List/Create events
 # GET/PUT/PATCH/DELETE /api/events/{id}/                  - Retrieve/Update/Delete event
 # POST         /api/events/{id}/rsvp/                     - RSVP to event
 # GET          /api/events/{id}/rsvp_list/                - Get RSVP list (admin only)
-# GET          /api/events/{id}/analytics/                - Get event analytics
+# GET          /api/events/{id}/analytics/                - Get event analytics (?include=daily adds the 30-day series)
 # GET          /api/events/my_events/                     - Get user's events
 # GET          /api/events/upcoming/                      - Get upcoming events
 
-# GET/POST     /api/media/                                - List/Upload media
+# GET/POST     /api/media/                                - List/Upload media (?stream=1 streams long lists)
 # GET/PUT/PATCH/DELETE /api/media/{id}/                   - Retrieve/Update/Delete media
-# GET          /api/media/my_uploads/                     - Get user's uploads
+# GET          /api/media/my_uploads/                     - Get user's uploads (?stream=1 as above)
 
 # GET/POST     /api/groups/                               - List/Create groups
 # GET/PUT/PATCH/DELETE /api/groups/{id}/                  - Retrieve/Update/Delete group
@@ -12,7 +12,22 @@ import logging                                    # ✅ for logger
 from softservice.db_utils import ensure_alias_for_client  # Update the import path as needed
 
 # setup logger
-logger = logging.getLogger(_name_)
+logger = logging.getLogger(__name__)
+
+# Aliases this process has already migrated; repeat registrations skip migrate
+_MIGRATED_ALIASES = set()
+
+
+def _parse_client_id(value):
+    """Return value as an int if it is one (or an integer string), else None"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return None
+    return None
 
 class RegisterDBByClientAPIView(APIView):
     authentication_classes = []
@@ -28,24 +43,31 @@ class RegisterDBByClientAPIView(APIView):
 
         try:
             alias = ensure_alias_for_client(
-                client_id=int(client_id) if str(client_id).isdigit() else None,
+                client_id=_parse_client_id(client_id),
                 client_username=client_username if not client_id else None,
             )
 
             # Run migration automatically if DEBUG or env set
-            if settings.DEBUG or str(os.getenv("ASSET_AUTO_MIGRATE", "0")) == "1":
-                out = StringIO()
-                call_command(
-                    "migrate", "api", database=alias,
-                    interactive=False, verbosity=1, stdout=out
-                )
-                logger.info("Migrated app 'api' on %s\n%s", alias, out.getvalue())
-
-            # Close connection after migration
-            try:
-                connections[alias].close()
-            except Exception:
-                pass
+            auto_migrate = settings.DEBUG or str(os.getenv("ASSET_AUTO_MIGRATE", "0")) == "1"
+            if auto_migrate and alias not in _MIGRATED_ALIASES:
+                # Only capture the migrate transcript when it will be logged
+                if logger.isEnabledFor(logging.INFO):
+                    out = StringIO()
+                    call_command(
+                        "migrate", "api", database=alias,
+                        interactive=False, verbosity=1, stdout=out
+                    )
+                    logger.info("Migrated app 'api' on %s\n%s", alias, out.getvalue())
+                else:
+                    with open(os.devnull, "w") as devnull:
+                        call_command(
+                            "migrate", "api", database=alias,
+                            interactive=False, verbosity=0, stdout=devnull
+                        )
+                _MIGRATED_ALIASES.add(alias)
+
+            # Keep the connection for reuse under CONN_MAX_AGE; only drop it if broken
+            connections[alias].close_if_unusable_or_obsolete()
 
             return Response({"detail": "Alias ready", "alias": alias}, status=201)
 
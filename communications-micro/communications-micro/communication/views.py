@@ -1,14 +1,24 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action,api_view
 from rest_framework.response import Response
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count, F
+from django.db.models import Case, Count, Exists, F, OuterRef, Q, Value, When
+from django.db.models.functions import TruncDate
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from datetime import datetime, timedelta
+import hashlib
+import hmac
+from itertools import islice
 from django.conf import settings
+from django.db import transaction
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
 
-from .models import Broadcast, Event, Media, Group, BroadcastView, EventRSVPLog
+from .models import Broadcast, Event, Media, Group, BroadcastView, EventRSVPLog, active_user_count, bump_list_version, list_version
 from .serializers import (
     BroadcastListSerializer, BroadcastDetailSerializer, BroadcastAcknowledgeSerializer,
     EventListSerializer, EventDetailSerializer, RSVPSerializer,
@@ -24,9 +34,11 @@ from .filters import BroadcastFilter, EventFilter
 
 @api_view(['POST'])
 def auto_onboard(request):
-    auth_token = request.headers.get("Authorization")
+    auth_token = request.headers.get("Authorization") or ""
+    expected = settings.INTERNAL_REGISTER_DB_TOKEN
     
-    if auth_token != f"Token {settings.INTERNAL_REGISTER_DB_TOKEN}":
+    # Constant-time comparison; an unset token never matches
+    if not expected or not hmac.compare_digest(auth_token.encode(), f"Token {expected}".encode()):
         return Response({"detail": "Invalid token"}, status=403)
 
     data = request.data
@@ -40,7 +52,94 @@ def auto_onboard(request):
     return Response({"detail": f"Tenant {tenant_username} onboarded successfully"}, status=201)
 
 
-class BroadcastViewSet(viewsets.ModelViewSet):
+class RSVPListPagination(PageNumberPagination):
+    """Pages for one RSVP bucket (?status=yes|no|maybe)"""
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+def analytics_cache_enabled():
+    """Analytics are cached only in a shared cache, so every worker sees invalidations"""
+    return settings.SHARED_CACHE and settings.ANALYTICS_CACHE_TIMEOUT > 0
+
+
+def analytics_cache_key(kind, pk, daily=False):
+    """Cache key for one object's analytics payload; rolls over daily with the 30-day window"""
+    variant = 'daily' if daily else 'totals'
+    return f'communication:{kind}_analytics:{pk}:{variant}:{timezone.now().date().isoformat()}'
+
+
+def invalidate_analytics(kind, pk):
+    """Drop both the totals-only and the ?include=daily payloads for one object"""
+    if analytics_cache_enabled():
+        cache.delete_many([analytics_cache_key(kind, pk), analytics_cache_key(kind, pk, daily=True)])
+
+
+def wants_daily(request):
+    """True for ?include=daily (comma-separated include list)"""
+    return 'daily' in request.query_params.get('include', '').split(',')
+
+
+def conditional_etag(request, kind):
+    """ETag over the kind's list version, the user and the full URL, per minute; None without a shared cache"""
+    # A per-process version would hand out ETags that other workers never invalidate
+    if not settings.SHARED_CACHE:
+        return None
+    # The minute bucket covers time-derived fields (is_visible, is_upcoming, the 30-day window)
+    stamp = f'{list_version(kind)}:{request.user.pk}:{request.get_full_path()}:{timezone.now():%Y%m%d%H%M}'
+    return quote_etag(hashlib.md5(stamp.encode()).hexdigest())
+
+
+def daily_counts(queryset, field, start_date, end_date):
+    """Per-day row counts over [start_date, end_date] from one GROUP BY, zero-filled"""
+    tz = timezone.get_current_timezone()
+    since = datetime.combine(start_date, datetime.min.time(), tzinfo=tz)
+    until = datetime.combine(end_date + timedelta(days=1), datetime.min.time(), tzinfo=tz)
+    # Plain datetime bounds keep the (fk, timestamp) index usable
+    counts = dict(
+        queryset.filter(**{f'{field}__gte': since, f'{field}__lt': until})
+        .annotate(day=TruncDate(field))
+        .order_by()
+        .values('day')
+        .annotate(count=Count('id'))
+        .values_list('day', 'count')
+    )
+
+    dates = (start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1))
+    return [{'date': day.isoformat(), 'count': counts.get(day, 0)} for day in dates]
+
+
+class RequestContextMixin:
+    """Resolve per-request values once for all serializer method fields"""
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        user = self.request.user
+        context['uid'] = user.id if user.is_authenticated else None
+        context['abs_prefix'] = self.request.build_absolute_uri('/').rstrip('/')
+        return context
+
+
+class ConditionalGetMixin:
+    """If-None-Match support for GET actions whose payload tracks list_version(kind)"""
+    _etag = None
+
+    def check_not_modified(self, kind):
+        """304 if the client already holds the current ETag; call once permissions have been checked"""
+        self._etag = conditional_etag(self.request, kind)
+        if self._etag is None:
+            return None
+        return get_conditional_response(self.request, etag=self._etag)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self._etag is not None and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = self._etag
+        return response
+
+
+class BroadcastViewSet(ConditionalGetMixin, RequestContextMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing broadcasts
     """
@@ -51,25 +150,33 @@ class BroadcastViewSet(viewsets.ModelViewSet):
     search_fields = ['title', 'description']
     ordering_fields = ['created_at', 'start_date', 'priority']
     ordering = ['-created_at']
+    # Actions that serialize broadcasts and benefit from eager loading
+    eager_loading_actions = ('list', 'retrieve', 'my_broadcasts')
 
     def get_serializer_class(self):
         if self.action == 'list':
             return BroadcastListSerializer
         return BroadcastDetailSerializer
 
+    def check_object_permissions(self, request, obj):
+        # Share the request timestamp with Broadcast.is_visible
+        obj._now_override = getattr(request, '_now', None)
+        super().check_object_permissions(request, obj)
+
     def get_queryset(self):
         """Filter broadcasts based on user permissions"""
         user = self.request.user
+        queryset = self.queryset.with_user_context(user)
+        if self.action in self.eager_loading_actions:
+            queryset = self.get_serializer_class().setup_eager_loading(queryset)
+        elif self.action == 'analytics':
+            # View/ack/recipient totals come back with the broadcast row
+            queryset = queryset.with_ack_rate().with_view_count()
         if user.is_staff:
-            return self.queryset
+            return queryset
         
         # Filter based on audience targeting
-        return self.queryset.filter(
-            Q(audience_type='all') |
-            Q(audience_type='groups', target_groups__members=user) |
-            Q(audience_type='users', target_users=user) |
-            Q(created_by=user)
-        ).distinct()
+        return queryset.targeting(user)
 
     @action(detail=True, methods=['post'], permission_classes=[CanAcknowledgeBroadcast])
     def acknowledge(self, request, pk=None):
@@ -84,6 +191,7 @@ class BroadcastViewSet(viewsets.ModelViewSet):
                 broadcast.acknowledged_by.add(request.user)
             else:
                 broadcast.acknowledged_by.remove(request.user)
+            invalidate_analytics('broadcast', broadcast.pk)
             
             return Response({
                 'message': f'Broadcast {"acknowledged" if acknowledged else "unacknowledged"} successfully',
@@ -97,16 +205,15 @@ class BroadcastViewSet(viewsets.ModelViewSet):
         """Mark broadcast as viewed"""
         broadcast = self.get_object()
         
-        # Add user to viewed_by if not already viewed
-        if not broadcast.viewed_by.filter(id=request.user.id).exists():
+        # The unique (broadcast, user) view log decides whether this is a first view
+        _, created = BroadcastView.objects.get_or_create(
+            broadcast=broadcast,
+            user=request.user,
+            defaults={'ip_address': self.get_client_ip(request)}
+        )
+        if created:
             broadcast.viewed_by.add(request.user)
-            
-            # Create view log
-            BroadcastView.objects.get_or_create(
-                broadcast=broadcast,
-                user=request.user,
-                defaults={'ip_address': self.get_client_ip(request)}
-            )
+            invalidate_analytics('broadcast', broadcast.pk)
         
         return Response({'message': 'Broadcast marked as viewed'})
 
@@ -114,46 +221,45 @@ class BroadcastViewSet(viewsets.ModelViewSet):
     def analytics(self, request, pk=None):
         """Get broadcast analytics"""
         broadcast = self.get_object()
+        # After get_object(), so object permissions are re-checked before any 304
+        not_modified = self.check_not_modified('broadcast')
+        if not_modified is not None:
+            return not_modified
+        include_daily = wants_daily(request)
+        # Served from cache until a view/ack on this broadcast invalidates it
+        cache_key = analytics_cache_key('broadcast', broadcast.pk, daily=include_daily) if analytics_cache_enabled() else None
+        data = cache.get(cache_key) if cache_key else None
+        if data is not None:
+            return Response(data)
         
-        # Calculate daily views and acknowledgments for last 30 days
-        end_date = timezone.now().date()
-        start_date = end_date - timedelta(days=30)
-        
-        daily_views = []
-        daily_acknowledgments = []
-        
-        current_date = start_date
-        while current_date <= end_date:
-            views_count = BroadcastView.objects.filter(
-                broadcast=broadcast,
-                viewed_at__date=current_date
-            ).count()
-            
-            # For acknowledgments, we need to check if they were done on this date
-            # Since we don't track acknowledgment date, we'll use a simpler approach
-            daily_views.append({
-                'date': current_date.isoformat(),
-                'count': views_count
-            })
-            
-            current_date += timedelta(days=1)
-
         analytics_data = {
             'total_recipients': broadcast.total_recipients,
-            'total_views': broadcast.viewed_by.count(),
-            'total_acknowledgments': broadcast.acknowledged_by.count(),
+            'total_views': broadcast.view_count_,
+            'total_acknowledgments': broadcast.ack_count_,
             'acknowledgment_rate': broadcast.acknowledgment_rate,
-            'view_rate': (broadcast.viewed_by.count() / broadcast.total_recipients * 100) if broadcast.total_recipients > 0 else 0,
-            'daily_views': daily_views,
-            'daily_acknowledgments': []  # Simplified for now
+            'view_rate': (broadcast.view_count_ / broadcast.total_recipients * 100) if broadcast.total_recipients > 0 else 0,
         }
+        if include_daily:
+            # Calculate daily views and acknowledgments for last 30 days
+            end_date = timezone.now().date()
+            start_date = end_date - timedelta(days=30)
+            analytics_data['daily_views'] = daily_counts(
+                BroadcastView.objects.filter(broadcast=broadcast), 'viewed_at', start_date, end_date
+            )
+            analytics_data['daily_acknowledgments'] = []  # Simplified for now
         
         serializer = BroadcastAnalyticsSerializer(analytics_data)
+        if cache_key:
+            cache.set(cache_key, serializer.data, settings.ANALYTICS_CACHE_TIMEOUT)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def my_broadcasts(self, request):
         """Get current user's created broadcasts"""
+        # DRF has already run authentication and has_permission for this request
+        not_modified = self.check_not_modified('broadcast')
+        if not_modified is not None:
+            return not_modified
         queryset = self.get_queryset().filter(created_by=request.user)
         page = self.paginate_queryset(queryset)
         
@@ -165,16 +271,20 @@ class BroadcastViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     def get_client_ip(self, request):
-        """Get client IP address"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
+        """Get client IP address (resolved once per request)"""
+        ip = getattr(request, '_client_ip', None)
+        if ip is None:
+            x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+            if x_forwarded_for:
+                # First hop only; partition avoids building the whole hop list
+                ip = x_forwarded_for.partition(',')[0].strip()
+            else:
+                ip = request.META.get('REMOTE_ADDR')
+            request._client_ip = ip
         return ip
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(ConditionalGetMixin, RequestContextMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing events
     """
@@ -185,6 +295,8 @@ class EventViewSet(viewsets.ModelViewSet):
     search_fields = ['title', 'description', 'venue']
     ordering_fields = ['created_at', 'date', 'time']
     ordering = ['date', 'time']
+    # Actions that serialize events and benefit from eager loading
+    eager_loading_actions = ('list', 'retrieve', 'my_events', 'upcoming')
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -194,16 +306,17 @@ class EventViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter events based on user permissions"""
         user = self.request.user
+        queryset = self.queryset.with_user_context(user).with_upcoming()
+        if self.action in self.eager_loading_actions:
+            queryset = self.get_serializer_class().setup_eager_loading(queryset)
+        elif self.action == 'analytics':
+            # RSVP totals come back with the event row instead of one COUNT each
+            queryset = queryset.with_rsvp_counts()
         if user.is_staff:
-            return self.queryset
+            return queryset
         
         # Filter based on visibility settings
-        return self.queryset.filter(
-            Q(is_public=True) |
-            Q(visible_to_users=user) |
-            Q(visible_to_groups__members=user) |
-            Q(created_by=user)
-        ).distinct()
+        return queryset.visible_to(user)
 
     @action(detail=True, methods=['post'], permission_classes=[CanRSVPToEvent])
     def rsvp(self, request, pk=None):
@@ -215,27 +328,28 @@ class EventViewSet(viewsets.ModelViewSet):
             new_status = serializer.validated_data['status']
             old_status = event.get_user_rsvp_status(request.user)
             
-            # Remove user from all RSVP lists first
-            event.rsvp_yes.remove(request.user)
-            event.rsvp_no.remove(request.user)
-            event.rsvp_maybe.remove(request.user)
-            
-            # Add user to appropriate RSVP list
-            if new_status == 'yes':
-                event.rsvp_yes.add(request.user)
-            elif new_status == 'no':
-                event.rsvp_no.add(request.user)
-            elif new_status == 'maybe':
-                event.rsvp_maybe.add(request.user)
-            
-            # Log RSVP change
-            EventRSVPLog.objects.create(
-                event=event,
-                user=request.user,
-                old_status=old_status,
-                new_status=new_status
-            )
+            with transaction.atomic():
+                # This view is the only writer of the log row for this change
+                event._rsvp_logged_by_view = True
+                # Only touch the lists that change: drop the old status, add the new one
+                if old_status != new_status:
+                    if old_status:
+                        getattr(event, f'rsvp_{old_status}').remove(request.user)
+                    getattr(event, f'rsvp_{new_status}').add(request.user)
+                
+                # Log RSVP change
+                EventRSVPLog.objects.create(
+                    event=event,
+                    user=request.user,
+                    old_status=old_status,
+                    new_status=new_status
+                )
+            invalidate_analytics('event', event.pk)
+            # A repeated status only adds a log row, which no m2m signal reports
+            bump_list_version('event')
             
+            # Fresh totals in one query rather than a COUNT per status
+            event = Event.objects.with_rsvp_counts().only('id').get(pk=event.pk)
             return Response({
                 'message': f'RSVP updated to {new_status}',
                 'status': new_status,
@@ -246,18 +360,39 @@ class EventViewSet(viewsets.ModelViewSet):
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    @action(detail=True, methods=['get'], permission_classes=[IsAdminOrReadOnly])
+    @action(detail=True, methods=['get'], permission_classes=[IsAdminOrReadOnly],
+            pagination_class=RSVPListPagination)
     def rsvp_list(self, request, pk=None):
         """Get RSVP list for an event (admin/owner only)"""
         event = self.get_object()
         
         from .serializers import UserSerializer
+        user_fields = UserSerializer.Meta.fields
         
-        rsvp_data = {
-            'yes': UserSerializer(event.rsvp_yes.all(), many=True).data,
-            'no': UserSerializer(event.rsvp_no.all(), many=True).data,
-            'maybe': UserSerializer(event.rsvp_maybe.all(), many=True).data,
-        }
+        # ?status=yes|no|maybe returns that one bucket, paginated
+        bucket = request.query_params.get('status')
+        if bucket in ('yes', 'no', 'maybe'):
+            queryset = getattr(event, f'rsvp_{bucket}').only(*user_fields).order_by('id')
+            page = self.paginate_queryset(queryset)
+            return self.get_paginated_response(UserSerializer(page, many=True).data)
+        
+        # One query tagging each responder with their status, one serializer pass, grouped here
+        from django.contrib.auth.models import User
+        statuses = [
+            (bucket, Exists(getattr(Event, f'rsvp_{bucket}').through.objects.filter(
+                event_id=event.pk, user_id=OuterRef('pk')
+            )))
+            for bucket in ('yes', 'no', 'maybe')
+        ]
+        users = list(
+            User.objects.only(*user_fields)
+            .filter(Q(statuses[0][1]) | Q(statuses[1][1]) | Q(statuses[2][1]))
+            .annotate(rsvp_status=Case(*[When(exists, then=Value(bucket)) for bucket, exists in statuses]))
+            .order_by('id')
+        )
+        rsvp_data = {'yes': [], 'no': [], 'maybe': []}
+        for user, data in zip(users, UserSerializer(users, many=True).data):
+            rsvp_data[user.rsvp_status].append(data)
         
         return Response(rsvp_data)
 
@@ -265,26 +400,17 @@ class EventViewSet(viewsets.ModelViewSet):
     def analytics(self, request, pk=None):
         """Get event analytics"""
         event = self.get_object()
+        # After get_object(), so object permissions are re-checked before any 304
+        not_modified = self.check_not_modified('event')
+        if not_modified is not None:
+            return not_modified
+        include_daily = wants_daily(request)
+        # Served from cache until an RSVP on this event invalidates it
+        cache_key = analytics_cache_key('event', event.pk, daily=include_daily) if analytics_cache_enabled() else None
+        data = cache.get(cache_key) if cache_key else None
+        if data is not None:
+            return Response(data)
         
-        # Calculate daily RSVP changes for last 30 days
-        end_date = timezone.now().date()
-        start_date = end_date - timedelta(days=30)
-        
-        daily_rsvp = []
-        current_date = start_date
-        while current_date <= end_date:
-            rsvp_count = EventRSVPLog.objects.filter(
-                event=event,
-                changed_at__date=current_date
-            ).count()
-            
-            daily_rsvp.append({
-                'date': current_date.isoformat(),
-                'count': rsvp_count
-            })
-            
-            current_date += timedelta(days=1)
-
         total_visible_users = self.get_total_visible_users(event)
         
         analytics_data = {
@@ -293,15 +419,27 @@ class EventViewSet(viewsets.ModelViewSet):
             'total_rsvp_maybe': event.total_rsvp_maybe,
             'total_rsvp': event.total_rsvp,
             'rsvp_rate': (event.total_rsvp / total_visible_users * 100) if total_visible_users > 0 else 0,
-            'daily_rsvp': daily_rsvp
         }
+        if include_daily:
+            # Calculate daily RSVP changes for last 30 days
+            end_date = timezone.now().date()
+            start_date = end_date - timedelta(days=30)
+            analytics_data['daily_rsvp'] = daily_counts(
+                EventRSVPLog.objects.filter(event=event), 'changed_at', start_date, end_date
+            )
         
         serializer = EventAnalyticsSerializer(analytics_data)
+        if cache_key:
+            cache.set(cache_key, serializer.data, settings.ANALYTICS_CACHE_TIMEOUT)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def my_events(self, request):
         """Get current user's created events"""
+        # DRF has already run authentication and has_permission for this request
+        not_modified = self.check_not_modified('event')
+        if not_modified is not None:
+            return not_modified
         queryset = self.get_queryset().filter(created_by=request.user)
         page = self.paginate_queryset(queryset)
         
@@ -315,6 +453,10 @@ class EventViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
         """Get upcoming events"""
+        # DRF has already run authentication and has_permission for this request
+        not_modified = self.check_not_modified('event')
+        if not_modified is not None:
+            return not_modified
         queryset = self.get_queryset().filter(date__gte=timezone.now().date())
         page = self.paginate_queryset(queryset)
         
@@ -330,23 +472,20 @@ class EventViewSet(viewsets.ModelViewSet):
         from django.contrib.auth.models import User
         
         if event.is_public:
-            return User.objects.filter(is_active=True).count()
-        
-        visible_users = set()
-        
-        # Add directly visible users
-        for user in event.visible_to_users.all():
-            visible_users.add(user.id)
+            return active_user_count()
         
-        # Add users from visible groups
-        for group in event.visible_to_groups.all():
-            for user in group.members.all():
-                visible_users.add(user.id)
-        
-        return len(visible_users)
+        # One COUNT over the union of direct and group visibility; IN-subqueries dedupe
+        direct = Event.visible_to_users.through.objects.filter(event_id=event.pk).values('user_id')
+        via_groups = Group.members.through.objects.filter(
+            group_id__in=Event.visible_to_groups.through.objects.filter(event_id=event.pk).values('group_id')
+        ).values('user_id')
+        return User.objects.filter(
+            Q(id__in=direct) | Q(id__in=via_groups),
+            is_active=True
+        ).count()
 
 
-class MediaViewSet(viewsets.ModelViewSet):
+class MediaViewSet(RequestContextMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing media uploads
     """
@@ -358,6 +497,10 @@ class MediaViewSet(viewsets.ModelViewSet):
     search_fields = ['file_name']
     ordering_fields = ['uploaded_at']
     ordering = ['-uploaded_at']
+    # Columns MediaSerializer renders; list responses load nothing else
+    list_fields = ('id', 'file', 'file_name', 'file_type', 'file_size', 'uploaded_at')
+    # Rows per rendered chunk for ?stream=1 responses
+    stream_chunk_size = 500
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -367,23 +510,59 @@ class MediaViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter media based on user permissions"""
         user = self.request.user
+        queryset = self.queryset
+        if self.action == 'list':
+            queryset = queryset.only(*self.list_fields)
         if user.is_staff:
-            return self.queryset
-        return self.queryset.filter(uploaded_by=user)
+            return queryset
+        return queryset.filter(uploaded_by=user)
+
+    def list(self, request, *args, **kwargs):
+        return self.list_response(self.filter_queryset(self.get_queryset()))
 
     @action(detail=False, methods=['get'])
     def my_uploads(self, request):
         """Get current user's uploaded media"""
-        queryset = self.queryset.filter(uploaded_by=request.user)
+        queryset = self.queryset.only(*self.list_fields).filter(uploaded_by=request.user)
+        return self.list_response(queryset)
+
+    def list_response(self, queryset):
+        """Paginated when configured; streamed with ?stream=1 (JSON only); otherwise a normal Response"""
         page = self.paginate_queryset(queryset)
-        
         if page is not None:
             serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
         
+        renderer = self.request.accepted_renderer
+        if renderer.format == 'json' and self.request.query_params.get('stream') in ('1', 'true'):
+            return self.stream_response(queryset, renderer)
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    def stream_response(self, queryset, renderer):
+        """One JSON array built stream_chunk_size rows at a time off a server-side cursor
+
+        The first chunk is rendered before the response is returned, so a failing
+        query or serializer still produces a normal error response. A failure in a
+        later chunk aborts the stream, leaving the client a truncated, unparseable
+        body rather than a complete-looking one.
+        """
+        rows = queryset.iterator(chunk_size=self.stream_chunk_size)
+        first = self.render_chunk(list(islice(rows, self.stream_chunk_size)), renderer)
+        
+        def body():
+            yield b'[' + first
+            for chunk in iter(lambda: list(islice(rows, self.stream_chunk_size)), []):
+                yield b',' + self.render_chunk(chunk, renderer)
+            yield b']'
+        
+        return StreamingHttpResponse(body(), content_type=renderer.media_type)
+
+    def render_chunk(self, objs, renderer):
+        """Render objs as a JSON array and strip the brackets so chunks splice into one array"""
+        serializer = self.get_serializer_class()(objs, many=True, context=self.get_serializer_context())
+        return renderer.render(serializer.data)[1:-1]
+
 
 class GroupViewSet(viewsets.ModelViewSet):
     """
@@ -401,16 +580,12 @@ class GroupViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter groups based on user permissions"""
         user = self.request.user
+        queryset = self.queryset.with_members_count()
         if user.is_staff:
-            return self.queryset
+            return queryset
         
         # Return public groups, groups user is a member of, or groups user owns
-        return self.queryset.filter(
-            Q(group_type='public') |
-            Q(members=user) |
-            Q(owners=user) |
-            Q(created_by=user)
-        ).distinct()
+        return queryset.accessible_to(user)
 
     @action(detail=True, methods=['post'])
     def join(self, request, pk=None):
@@ -436,7 +611,7 @@ class GroupViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def my_groups(self, request):
         """Get groups user is a member of"""
-        queryset = self.queryset.filter(members=request.user)
+        queryset = self.queryset.with_members_count().filter(members=request.user)
         page = self.paginate_queryset(queryset)
         
         if page is not None:
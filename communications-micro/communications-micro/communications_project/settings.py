@@ -52,6 +52,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'communication.middleware.RequestTimeMiddleware',
 ]
 
 ROOT_URLCONF = 'communications_project.urls'
@@ -89,6 +90,28 @@ DATABASES = {
 }
 
 
+# Cache
+# Shared Redis cache when REDIS_URL is set; per-process local memory otherwise
+
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+
+# Caches that are invalidated on writes (analytics payloads, conditional-GET
+# versions) are only correct when every worker sees the same store, so they
+# stay off unless the shared Redis cache above is configured
+SHARED_CACHE = bool(os.getenv("REDIS_URL"))
+
+# Seconds an analytics payload may be served from the shared cache. API writes
+# (acknowledge, mark_viewed, rsvp) invalidate it at once; changes made outside
+# the API (admin, shell) can leave analytics stale for up to this long.
+ANALYTICS_CACHE_TIMEOUT = int(os.getenv("ANALYTICS_CACHE_TIMEOUT", "120"))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -130,6 +153,13 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'communication.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
 # Custom environment variables
 DB_ENCRYPTION_KEY = os.getenv("DB_ENCRYPTION_KEY")
 INTERNAL_REGISTER_DB_TOKEN = os.getenv("INTERNAL_REGISTER_DB_TOKEN")
\ No newline at end of file